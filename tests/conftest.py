@@ -0,0 +1,262 @@
+"""Shared fixtures for the worktrees test suite."""
+
+import json
+import shutil
+from types import SimpleNamespace
+from unittest.mock import call
+
+import pytest
+import typer
+from click.testing import CliRunner
+
+from worktrees.cli import app
+from worktrees.cli import mark as mark_mod
+from worktrees.cli import status as status_mod
+from worktrees.cli import tmux as tmux_mod
+from worktrees.config import WORKTREES_JSON, WorktreesConfig
+from worktrees.git import Worktree
+from worktrees.user_config import DEFAULT_PROMPT, PROVIDER_DEFAULTS, UserConfig
+
+_BASE_CONFIG = {
+    "version": "1.0",
+    "worktreesDir": ".",
+    "setup": {"autoDetect": True, "commands": []},
+    "marks": {},
+}
+_BASE_CONFIG_BYTES = json.dumps(_BASE_CONFIG).encode()
+
+_runner = CliRunner()
+
+
+def _main_worktree(root):
+    """Build the main worktree entry for a project rooted at *root*."""
+    return Worktree(path=root / "main", branch="main", commit="abc123")
+
+
+class _Recorder:
+    """Callable that records each call and returns ``ret``.
+
+    Set ``error`` to an exception instance to make calls raise it instead.
+    Calls are recorded as ``unittest.mock.call`` entries.
+    """
+
+    def __init__(self, ret=None, error=None):
+        self.ret = ret
+        self.error = error
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(call(*args, **kwargs))
+        if self.error is not None:
+            raise self.error
+        return self.ret
+
+
+class _AIStub:
+    """Stand-in for AIConfig whose build_command is a _Recorder."""
+
+    def __init__(
+        self,
+        provider="claude",
+        command="",
+        prompt=DEFAULT_PROMPT,
+        built_command="echo merging",
+    ):
+        self.provider = provider
+        self.command = command
+        self.prompt = prompt
+        self.build_command = _Recorder(built_command)
+
+    def get_effective_command(self):
+        if self.command:
+            return self.command
+        return PROVIDER_DEFAULTS[self.provider]["command"]
+
+
+class _CfgStub:
+    """Stand-in for UserConfig that counts save calls."""
+
+    def __init__(self, configured=True, **ai):
+        self.configured = configured
+        self.ai = _AIStub(**ai)
+        self.saves = 0
+
+    def is_configured(self):
+        return self.configured
+
+    def save(self):
+        self.saves += 1
+
+
+@pytest.fixture(scope="session")
+def _project_template(tmp_path_factory):
+    """Write the initialized project config once per session."""
+    template = tmp_path_factory.mktemp("project_template")
+    (template / WORKTREES_JSON).write_bytes(_BASE_CONFIG_BYTES)
+    return template
+
+
+@pytest.fixture
+def initialized_project(_project_template, tmp_path_factory):
+    """Create an initialized worktrees project, removed again after the test."""
+    project = tmp_path_factory.mktemp("project")
+    shutil.copytree(_project_template, project, dirs_exist_ok=True)
+    yield project
+    shutil.rmtree(project, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def initialized_project_ro(_project_template, tmp_path_factory):
+    """Create an initialized project shared by tests that never write into it."""
+    project = tmp_path_factory.mktemp("project_ro")
+    shutil.copytree(_project_template, project, dirs_exist_ok=True)
+    return project
+
+
+@pytest.fixture(scope="session")
+def write_config():
+    """Return a helper that rewrites a project's config.
+
+    Keyword arguments replace top-level keys of the base config; with none
+    given, the precomputed base bytes are written as-is.
+    """
+
+    def _write(path, **overrides):
+        data = _BASE_CONFIG_BYTES
+        if overrides:
+            data = json.dumps({**_BASE_CONFIG, **overrides}).encode()
+        (path / WORKTREES_JSON).write_bytes(data)
+
+    return _write
+
+
+@pytest.fixture(scope="session")
+def read_marks():
+    """Return a helper that reads the marks saved in a project's config."""
+
+    def _read(path):
+        return json.loads((path / WORKTREES_JSON).read_bytes()).get("marks", {})
+
+    return _read
+
+
+@pytest.fixture(scope="session")
+def main_worktree():
+    """Return a factory for the main worktree entry of a project root."""
+    return _main_worktree
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Build a config for a project rooted at tmp_path."""
+    return WorktreesConfig(project_root=tmp_path)
+
+
+@pytest.fixture
+def main_wt(tmp_path):
+    """Create the main worktree directory of the tmp_path project."""
+    worktree = _main_worktree(tmp_path)
+    worktree.path.mkdir()
+    return worktree
+
+
+@pytest.fixture(scope="session")
+def recorder():
+    """Return the factory for call-recording stand-ins (``ret``, ``error``)."""
+    return _Recorder
+
+
+@pytest.fixture(scope="session")
+def click_app():
+    """Build the Click command tree for the Typer app once per session."""
+    return typer.main.get_command(app)
+
+
+@pytest.fixture
+def invoke(click_app):
+    """Invoke the CLI through the cached Click command."""
+    return lambda args, **kwargs: _runner.invoke(click_app, args, **kwargs)
+
+
+@pytest.fixture
+def run(click_app):
+    """Invoke the CLI and return (exit_code, output), like call_direct.
+
+    Unexpected exceptions propagate to pytest instead of being captured.
+    """
+
+    def _run(*args):
+        result = _runner.invoke(click_app, list(args), catch_exceptions=False)
+        return result.exit_code, result.output
+
+    return _run
+
+
+@pytest.fixture
+def call_direct(capsys):
+    """Call a command function directly, bypassing Click's argument parser.
+
+    Returns a callable yielding a tuple of (exit_code, combined output).
+    """
+
+    def _call(command, **kwargs):
+        try:
+            command(**kwargs)
+            exit_code = 0
+        except typer.Exit as e:
+            exit_code = e.exit_code
+        captured = capsys.readouterr()
+        return exit_code, captured.out + captured.err
+
+    return _call
+
+
+def _returning(value):
+    """Build a stand-in that returns ``value``, or raises it if an exception."""
+
+    def _stub(*args, **kwargs):
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    return _stub
+
+
+@pytest.fixture
+def cli_env(monkeypatch):
+    """Pin the working directory and git lookups seen by the CLI commands.
+
+    ``set_cwd`` really changes directory, so commands go through the real
+    ``Path.cwd``; the other setters swap attributes through monkeypatch
+    rather than stacking ``unittest.mock.patch`` context managers.
+    """
+
+    def set_cwd(path):
+        monkeypatch.chdir(path)
+
+    def set_worktrees(worktrees):
+        for module in (mark_mod, status_mod, tmux_mod):
+            monkeypatch.setattr(module, "list_worktrees", _returning(worktrees))
+
+    def set_current_worktree(name):
+        monkeypatch.setattr(mark_mod, "get_current_worktree_name", _returning(name))
+
+    def set_git(branch="main", *, valid=True, dirty=False):
+        monkeypatch.setattr(status_mod, "is_valid_worktree", _returning(valid))
+        monkeypatch.setattr(status_mod, "get_current_branch", _returning(branch))
+        monkeypatch.setattr(status_mod, "has_uncommitted_changes", _returning(dirty))
+
+    return SimpleNamespace(
+        set_cwd=set_cwd,
+        set_worktrees=set_worktrees,
+        set_current_worktree=set_current_worktree,
+        set_git=set_git,
+    )
+
+
+@pytest.fixture
+def mock_user_config(mocker):
+    """Patch UserConfig.load to return a configured claude config stub."""
+    config = _CfgStub()
+    mocker.patch.object(UserConfig, "load", return_value=config)
+    return config
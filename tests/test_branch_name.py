@@ -0,0 +1,63 @@
+"""Tests for worktree directory name encoding of branch names."""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from worktrees.cli import decode_branch_name, encode_branch_name
+
+# (branch, directory name) pairs that map exactly in both directions
+BRANCH_PAIRS = [
+    ("main", "main"),
+    ("feat/my-feature", "feat-slash-my-feature"),
+    ("category/subcategory/feature", "category-slash-subcategory-slash-feature"),
+    ("a/b/c", "a-slash-b-slash-c"),
+    ("release/v2.0", "release-slash-v2.0"),
+    ("fix/off-by-one", "fix-slash-off-by-one"),
+    ("", ""),
+]
+
+# Branches whose leading/trailing slashes are dropped, so they do not round-trip
+ENCODE_ONLY_PAIRS = [
+    ("feat/feature/", "feat-slash-feature"),
+    ("/feat/feature", "feat-slash-feature"),
+    ("/", ""),
+]
+
+# Slash-separated names of printable, non-slash characters. Names containing
+# "slash" are excluded: a literal "-slash-" cannot survive decoding.
+_SEGMENTS = st.text(
+    alphabet=st.characters(blacklist_categories=("Cc", "Cs"), blacklist_characters="/"),
+    min_size=1,
+    max_size=12,
+)
+_BRANCH_NAMES = (
+    st.lists(_SEGMENTS, max_size=4).map("/".join).filter(lambda b: "slash" not in b)
+)
+
+
+class TestBranchNameMapping:
+    """Tests for encode_branch_name() and decode_branch_name() on known pairs."""
+
+    @pytest.mark.parametrize(("decoded", "encoded"), BRANCH_PAIRS)
+    def test_encode_and_decode(self, decoded, encoded):
+        """Test a branch encodes to its directory name and decodes back."""
+        assert encode_branch_name(decoded) == encoded
+        assert decode_branch_name(encoded) == decoded
+
+    @pytest.mark.parametrize(("branch", "encoded"), ENCODE_ONLY_PAIRS)
+    def test_encode_strips_outer_slashes(self, branch, encoded):
+        """Test encoding strips leading and trailing slashes."""
+        assert encode_branch_name(branch) == encoded
+
+
+class TestBranchNameRoundTrip:
+    """Tests for encode/decode round-trip consistency."""
+
+    @given(_BRANCH_NAMES)
+    @settings(max_examples=200, deadline=None)
+    def test_round_trip(self, branch):
+        """Test that decode(encode(branch)) == branch and the encoding is flat."""
+        encoded = encode_branch_name(branch)
+        assert "/" not in encoded
+        assert decode_branch_name(encoded) == branch
@@ -1,936 +1,644 @@
 """Tests for advanced CLI commands (convert-old, environ, merge)."""
 
-import json
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from subprocess import CompletedProcess
+from unittest.mock import MagicMock, call
 
 import pytest
-from typer.testing import CliRunner
 
-from worktrees.cli import app
-from worktrees.config import WORKTREES_JSON
+from worktrees import user_config as user_config_mod
+from worktrees.cli import advanced as adv_mod
+from worktrees.cli.advanced import convert_old, environ, merge
 from worktrees.git import GitError, Worktree
 
-runner = CliRunner()
+pytestmark = pytest.mark.xdist_group("cli_mocks")
+
+_OK = CompletedProcess(args=[], returncode=0)
+_FAIL42 = CompletedProcess(args=[], returncode=42)
+
+
+def _patch_merge(mocker, project, **overrides):
+    """Patch merge's cwd and git helpers for a project at *project*.
+
+    Git helpers default to a clean "main" worktree; *overrides* replace them.
+    """
+    mocker.patch.object(Path, "cwd", return_value=project)
+    helpers = {
+        "is_valid_worktree": MagicMock(return_value=True),
+        "get_current_branch": MagicMock(return_value="main"),
+        "list_worktrees": MagicMock(return_value=[]),
+        **overrides,
+    }
+    mocker.patch.multiple(adv_mod, **helpers)
+    return helpers
+
+
+def _bare_worktree(root):
+    """Build the bare repository entry for a project rooted at *root*."""
+    return Worktree(path=root, branch="(bare)", commit="abc123")
 
 
 @pytest.fixture
-def initialized_project(tmp_path):
-    """Create an initialized worktrees project."""
-    config_file = tmp_path / WORKTREES_JSON
-    config_file.write_text(
-        json.dumps(
-            {
-                "version": "1.0",
-                "worktreesDir": ".",
-                "setup": {"autoDetect": True, "commands": []},
-                "marks": {},
-            }
-        )
+def fake_subprocess_run(monkeypatch, recorder):
+    """Replace subprocess.run with a recorder that returns a zero exit.
+
+    Set ``ret`` for another result, or ``error`` to make the call raise.
+    """
+    run = recorder(_OK)
+    monkeypatch.setattr("subprocess.run", run)
+    return run
+
+
+@pytest.fixture(scope="session")
+def main_and_feature_worktrees(initialized_project_ro, main_worktree):
+    """Describe main and feature worktrees of the shared read-only project.
+
+    The feature directory is never created, since has_uncommitted_changes
+    is always mocked in the tests that use these entries.
+    """
+    return (
+        main_worktree(initialized_project_ro),
+        Worktree(
+            path=initialized_project_ro / "feature", branch="feature", commit="def456"
+        ),
     )
-    return tmp_path
+
+
+@pytest.fixture
+def environ_worktree(initialized_project):
+    """Create a feature worktree next to a non-empty ENVIRON directory.
+
+    The ENVIRON entry is an empty placeholder: it only gets environ past its
+    empty-directory check, since symlink discovery and creation are mocked.
+    """
+    worktree_path = initialized_project / "feature"
+    worktree_path.mkdir()
+
+    environ_dir = initialized_project / "ENVIRON"
+    environ_dir.mkdir()
+    (environ_dir / ".env").touch()
+    return worktree_path
 
 
 class TestConvertOldCommand:
     """Tests for the convert-old command."""
 
-    def test_convert_old_requires_worktrees_json(self, tmp_path):
+    def test_convert_old_requires_worktrees_json(self, tmp_path, call_direct, mocker):
         """Test convert-old requires .worktrees.json file."""
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=tmp_path):
-            result = runner.invoke(app, ["convert-old"])
-            assert result.exit_code == 1
-            assert "not a worktrees project" in result.output
+        mocker.patch.object(Path, "cwd", return_value=tmp_path)
+
+        exit_code, output = call_direct(convert_old)
+        assert exit_code == 1
+        assert "not a worktrees project" in output
 
-    def test_convert_old_already_migrated(self, initialized_project):
+    def test_convert_old_already_migrated(
+        self, initialized_project, call_direct, mocker
+    ):
         """Test convert-old exits when .git/ directory already exists."""
         gitdir = initialized_project / ".git"
         gitdir.mkdir()
 
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=initialized_project):
-            result = runner.invoke(app, ["convert-old"])
-            assert result.exit_code == 0
-            assert "already migrated" in result.output
+        mocker.patch.object(Path, "cwd", return_value=initialized_project)
 
-    def test_convert_old_no_bare_repo(self, initialized_project):
+        exit_code, output = call_direct(convert_old)
+        assert exit_code == 0
+        assert "already migrated" in output
+
+    def test_convert_old_no_bare_repo(self, initialized_project, call_direct, mocker):
         """Test convert-old exits when no bare repository at root."""
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=initialized_project):
-            result = runner.invoke(app, ["convert-old"])
-            assert result.exit_code == 0
-            assert "nothing to migrate" in result.output
+        mocker.patch.object(Path, "cwd", return_value=initialized_project)
+
+        exit_code, output = call_direct(convert_old)
+        assert exit_code == 0
+        assert "nothing to migrate" in output
 
-    def test_convert_old_success(self, initialized_project):
+    def test_convert_old_success(
+        self, initialized_project, call_direct, mocker, main_worktree
+    ):
         """Test convert-old successfully migrates bare repo."""
         # Create bare repo files
         head_file = initialized_project / "HEAD"
         head_file.write_text("ref: refs/heads/main\n")
 
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.cli.advanced.migrate_to_dotgit") as mock_migrate:
-                with patch("worktrees.cli.advanced.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(
-                            path=initialized_project / "main",
-                            branch="main",
-                            commit="abc123",
-                        )
-                    ]
-
-                    result = runner.invoke(app, ["convert-old"])
-                    assert result.exit_code == 0
-                    assert "Migrated" in result.output
-                    assert "main" in result.output
-                    mock_migrate.assert_called_once_with(initialized_project)
-
-    def test_convert_old_git_error(self, initialized_project):
+        mocker.patch.object(Path, "cwd", return_value=initialized_project)
+        mock_migrate = mocker.patch.object(adv_mod, "migrate_to_dotgit")
+        mocker.patch.object(
+            adv_mod,
+            "list_worktrees",
+            return_value=[main_worktree(initialized_project)],
+        )
+
+        exit_code, output = call_direct(convert_old)
+        assert exit_code == 0
+        assert "Migrated" in output
+        assert "main" in output
+        mock_migrate.assert_called_once_with(initialized_project)
+
+    def test_convert_old_git_error(self, initialized_project, call_direct, mocker):
         """Test convert-old handles GitError."""
         head_file = initialized_project / "HEAD"
         head_file.write_text("ref: refs/heads/main\n")
 
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=initialized_project):
-            with patch(
-                "worktrees.cli.advanced.migrate_to_dotgit",
-                side_effect=GitError("migration failed"),
-            ):
-                result = runner.invoke(app, ["convert-old"])
-                assert result.exit_code == 1
-                assert "migration failed" in result.output
+        mocker.patch.object(Path, "cwd", return_value=initialized_project)
+        mocker.patch.object(
+            adv_mod,
+            "migrate_to_dotgit",
+            side_effect=GitError("migration failed"),
+        )
+
+        exit_code, output = call_direct(convert_old)
+        assert exit_code == 1
+        assert "migration failed" in output
 
-    def test_convert_old_excludes_bare_from_output(self, initialized_project):
+    def test_convert_old_excludes_bare_from_output(
+        self, initialized_project, call_direct, mocker, main_worktree
+    ):
         """Test convert-old does not list bare repo in output."""
         head_file = initialized_project / "HEAD"
         head_file.write_text("ref: refs/heads/main\n")
 
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.cli.advanced.migrate_to_dotgit"):
-                with patch("worktrees.cli.advanced.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(
-                            path=initialized_project, branch="(bare)", commit="abc123"
-                        ),
-                        Worktree(
-                            path=initialized_project / "main",
-                            branch="main",
-                            commit="abc123",
-                        ),
-                    ]
-
-                    result = runner.invoke(app, ["convert-old"])
-                    assert result.exit_code == 0
-                    # Should show "main" but not "(bare)"
-                    assert "main" in result.output
+        mocker.patch.object(Path, "cwd", return_value=initialized_project)
+        mocker.patch.object(adv_mod, "migrate_to_dotgit")
+        mocker.patch.object(
+            adv_mod,
+            "list_worktrees",
+            return_value=[
+                _bare_worktree(initialized_project),
+                main_worktree(initialized_project),
+            ],
+        )
+
+        exit_code, output = call_direct(convert_old)
+        assert exit_code == 0
+        # Should show "main" but not "(bare)"
+        assert "main" in output
 
 
 class TestEnvironCommand:
     """Tests for the environ command."""
 
-    def test_environ_requires_valid_worktree(self, tmp_path):
-        """Test environ command must be run from inside a worktree."""
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=tmp_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=False):
-                result = runner.invoke(app, ["environ"])
-                assert result.exit_code == 1
-                assert "not inside a worktree" in result.output
-
-    def test_environ_requires_project_root(self, tmp_path):
-        """Test environ command requires project root."""
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=tmp_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root", return_value=None
-                ):
-                    result = runner.invoke(app, ["environ"])
-                    assert result.exit_code == 1
-                    assert "cannot find project root" in result.output
-
-    def test_environ_no_environ_directory(self, initialized_project, tmp_path):
-        """Test environ command when ENVIRON directory doesn't exist."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    result = runner.invoke(app, ["environ"])
-                    assert result.exit_code == 0
-                    assert "no ENVIRON directory" in result.output
-
-    def test_environ_empty_environ_directory(self, initialized_project):
-        """Test environ command with empty ENVIRON directory."""
+    @pytest.mark.parametrize(
+        "is_valid, has_root, make_environ, expected_msg, expected_exit",
+        [
+            (False, False, False, "not inside a worktree", 1),
+            (True, False, False, "cannot find project root", 1),
+            (True, True, False, "no ENVIRON directory", 0),
+            (True, True, True, "empty", 0),
+        ],
+        ids=["not-in-worktree", "no-project-root", "no-environ-dir", "empty-environ"],
+    )
+    def test_environ_degenerate_state(
+        self,
+        initialized_project,
+        call_direct,
+        mocker,
+        is_valid,
+        has_root,
+        make_environ,
+        expected_msg,
+        expected_exit,
+    ):
+        """Test environ command exits early when a prerequisite is missing."""
         worktree_path = initialized_project / "feature"
         worktree_path.mkdir()
 
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
+        if make_environ:
+            (initialized_project / "ENVIRON").mkdir()
 
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    result = runner.invoke(app, ["environ"])
-                    assert result.exit_code == 0
-                    assert "empty" in result.output
+        project_root = initialized_project if has_root else None
 
-    def test_environ_creates_symlinks(self, initialized_project):
-        """Test environ command creates symlinks."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
-
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            return_value=[".env"],
-                        ):
-                            result = runner.invoke(app, ["environ"])
-                            assert result.exit_code == 0
-                            assert "Linked" in result.output
-                            assert ".env" in result.output
-
-    def test_environ_no_new_symlinks(self, initialized_project):
-        """Test environ command when all symlinks already exist."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
+        mocker.patch.object(Path, "cwd", return_value=worktree_path)
+        mocker.patch.object(adv_mod, "is_valid_worktree", return_value=is_valid)
+        if is_valid:
+            mocker.patch.object(adv_mod, "find_project_root", return_value=project_root)
 
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            return_value=[],
-                        ):
-                            result = runner.invoke(app, ["environ"])
-                            assert result.exit_code == 0
-                            assert "no new symlinks" in result.output
-
-    def test_environ_handles_git_error(self, initialized_project):
-        """Test environ command handles GitError."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
+        exit_code, output = call_direct(environ, remove_stale=False)
+        assert exit_code == expected_exit
+        assert expected_msg in output
 
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            side_effect=GitError("link error"),
-                        ):
-                            result = runner.invoke(app, ["environ"])
-                            assert result.exit_code == 1
-                            assert "link error" in result.output
-
-    def test_environ_finds_stale_symlinks(self, initialized_project):
-        """Test environ command finds and reports stale symlinks."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
+    def test_environ_creates_symlinks(
+        self, initialized_project, call_direct, mocker, environ_worktree
+    ):
+        """Test environ command creates symlinks."""
+        worktree_path = environ_worktree
+
+        mocker.patch.object(Path, "cwd", return_value=worktree_path)
+        mocker.patch.object(adv_mod, "is_valid_worktree", return_value=True)
+        mocker.patch.object(
+            adv_mod,
+            "find_project_root",
+            return_value=initialized_project,
+        )
+        mocker.patch.object(adv_mod, "find_stale_environ_symlinks", return_value=[])
+        mocker.patch.object(adv_mod, "create_environ_symlinks", return_value=[".env"])
 
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
+        exit_code, output = call_direct(environ, remove_stale=False)
+        assert exit_code == 0
+        assert "Linked" in output
+        assert ".env" in output
 
-        stale_link = worktree_path / ".old_env"
-        stale_link.write_text("")  # Create file so it exists
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[stale_link],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            return_value=[],
-                        ):
-                            # Use --remove-stale flag to avoid interactive prompt
-                            result = runner.invoke(app, ["environ", "--remove-stale"])
-                            assert result.exit_code == 0
-                            assert "Stale symlinks" in result.output
-
-    def test_environ_removes_stale_symlinks_with_flag(self, initialized_project):
-        """Test environ command removes stale symlinks with --remove-stale flag."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
+    def test_environ_no_new_symlinks(
+        self, initialized_project, call_direct, mocker, environ_worktree
+    ):
+        """Test environ command when all symlinks already exist."""
+        worktree_path = environ_worktree
+
+        mocker.patch.object(Path, "cwd", return_value=worktree_path)
+        mocker.patch.object(adv_mod, "is_valid_worktree", return_value=True)
+        mocker.patch.object(
+            adv_mod,
+            "find_project_root",
+            return_value=initialized_project,
+        )
+        mocker.patch.object(adv_mod, "find_stale_environ_symlinks", return_value=[])
+        mocker.patch.object(adv_mod, "create_environ_symlinks", return_value=[])
 
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
+        exit_code, output = call_direct(environ, remove_stale=False)
+        assert exit_code == 0
+        assert "no new symlinks" in output
 
-        stale_link = worktree_path / ".old_env"
-        stale_link.write_text("")  # Create file to be "removed"
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[stale_link],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            return_value=[],
-                        ):
-                            result = runner.invoke(app, ["environ", "--remove-stale"])
-                            assert result.exit_code == 0
-                            assert "removed" in result.output
-
-    def test_environ_prompts_for_stale_removal(self, initialized_project):
-        """Test environ command prompts for stale symlink removal."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
+    def test_environ_handles_git_error(
+        self, initialized_project, call_direct, mocker, environ_worktree
+    ):
+        """Test environ command handles GitError."""
+        worktree_path = environ_worktree
+
+        mocker.patch.object(Path, "cwd", return_value=worktree_path)
+        mocker.patch.object(adv_mod, "is_valid_worktree", return_value=True)
+        mocker.patch.object(
+            adv_mod,
+            "find_project_root",
+            return_value=initialized_project,
+        )
+        mocker.patch.object(adv_mod, "find_stale_environ_symlinks", return_value=[])
+        mocker.patch.object(
+            adv_mod,
+            "create_environ_symlinks",
+            side_effect=GitError("link error"),
+        )
 
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
+        exit_code, output = call_direct(environ, remove_stale=False)
+        assert exit_code == 1
+        assert "link error" in output
+
+    @pytest.mark.parametrize(
+        "args, confirm, msgs",
+        [
+            (["--remove-stale"], None, ("Stale symlinks", "removed")),
+            ([], False, ("skipped",)),
+            ([], True, ("removed",)),
+        ],
+        ids=["flag-removes", "prompt-skips", "prompt-removes"],
+    )
+    def test_environ_stale_symlinks(
+        self, initialized_project, invoke, mocker, environ_worktree, args, confirm, msgs
+    ):
+        """Test environ command reports stale symlinks and removes or skips them."""
+        worktree_path = environ_worktree
 
         stale_link = worktree_path / ".old_env"
+        stale_link.touch()  # the removal paths unlink it
+
+        mocker.patch.object(Path, "cwd", return_value=worktree_path)
+        mocker.patch.object(adv_mod, "is_valid_worktree", return_value=True)
+        mocker.patch.object(
+            adv_mod,
+            "find_project_root",
+            return_value=initialized_project,
+        )
+        mocker.patch.object(
+            adv_mod,
+            "find_stale_environ_symlinks",
+            return_value=[stale_link],
+        )
+        mocker.patch.object(adv_mod, "create_environ_symlinks", return_value=[])
+        if confirm is not None:
+            mock_confirm = mocker.patch("questionary.confirm")
+            mock_confirm.return_value.ask.return_value = confirm
 
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[stale_link],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            return_value=[],
-                        ):
-                            with patch("questionary.confirm") as mock_confirm:
-                                mock_confirm.return_value.ask.return_value = False
-
-                                result = runner.invoke(app, ["environ"])
-                                assert result.exit_code == 0
-                                assert "skipped" in result.output
-                                mock_confirm.assert_called_once()
-
-    def test_environ_user_confirms_stale_removal(self, initialized_project):
-        """Test environ command removes stale when user confirms."""
-        worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
-
-        environ_dir = initialized_project / "ENVIRON"
-        environ_dir.mkdir()
-        (environ_dir / ".env").write_text("TEST=value")
-
-        stale_link = worktree_path / ".old_env"
-        stale_link.write_text("")
-
-        with patch("worktrees.cli.advanced.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.advanced.is_valid_worktree", return_value=True):
-                with patch(
-                    "worktrees.cli.advanced.find_project_root",
-                    return_value=initialized_project,
-                ):
-                    with patch(
-                        "worktrees.cli.advanced.find_stale_environ_symlinks",
-                        return_value=[stale_link],
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.create_environ_symlinks",
-                            return_value=[],
-                        ):
-                            with patch("questionary.confirm") as mock_confirm:
-                                mock_confirm.return_value.ask.return_value = True
-
-                                result = runner.invoke(app, ["environ"])
-                                assert result.exit_code == 0
-                                assert "removed" in result.output
+        result = invoke(["environ", *args])
+        assert result.exit_code == 0
+        for msg in msgs:
+            assert msg in result.output
+        if confirm is not None:
+            mock_confirm.assert_called_once()
 
 
 class TestMergeCommand:
     """Tests for the merge command."""
 
-    def test_merge_requires_initialized(self, tmp_path):
+    def test_merge_requires_initialized(self, tmp_path, call_direct, mocker):
         """Test merge command requires initialized project."""
-        with patch("worktrees.config.Path.cwd", return_value=tmp_path):
-            result = runner.invoke(app, ["merge", "feature"])
-            assert result.exit_code == 1
-            assert "not initialized" in result.output
+        mocker.patch.object(Path, "cwd", return_value=tmp_path)
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 1
+        assert "not initialized" in output
 
-    def test_merge_requires_user_config(self, initialized_project, tmp_path):
+    def test_merge_requires_user_config(
+        self, initialized_project_ro, tmp_path, call_direct, mocker
+    ):
         """Test merge command requires AI configuration."""
         nonexistent_config = tmp_path / "nonexistent.json"
 
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", nonexistent_config):
-                with patch(
-                    "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                ):
-                    result = runner.invoke(app, ["merge", "feature"])
-                    assert result.exit_code == 1
-                    assert "not configured" in result.output
-                    assert "worktrees config" in result.output
-
-    def test_merge_requires_worktree(self, initialized_project, tmp_path):
+        mocker.patch.object(Path, "cwd", return_value=initialized_project_ro)
+        mocker.patch.object(user_config_mod, "GLOBAL_CONFIG_FILE", nonexistent_config)
+        mocker.patch.object(adv_mod, "is_valid_worktree", return_value=True)
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 1
+        assert "not configured" in output
+        assert "worktrees config" in output
+
+    def test_merge_requires_worktree(
+        self, initialized_project_ro, call_direct, mocker, mock_user_config
+    ):
         """Test merge command must be run from inside a worktree."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=False
-                    ):
-                        result = runner.invoke(app, ["merge", "feature"])
-                        assert result.exit_code == 1
-                        assert "inside a worktree" in result.output
-
-    def test_merge_get_current_branch_error(self, initialized_project, tmp_path):
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            is_valid_worktree=MagicMock(return_value=False),
+        )
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 1
+        assert "inside a worktree" in output
+
+    def test_merge_get_current_branch_error(
+        self, initialized_project_ro, call_direct, mocker, mock_user_config
+    ):
         """Test merge command handles get_current_branch errors."""
-        from worktrees.git import GitError
-
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            side_effect=GitError("test error"),
-                        ):
-                            result = runner.invoke(app, ["merge", "feature"])
-                            assert result.exit_code == 1
-                            assert "test error" in result.output
-
-    def test_merge_cannot_merge_into_self(self, initialized_project, tmp_path):
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            get_current_branch=MagicMock(side_effect=GitError("test error")),
+        )
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 1
+        assert "test error" in output
+
+    def test_merge_cannot_merge_into_self(
+        self, initialized_project_ro, call_direct, mocker, mock_user_config
+    ):
         """Test merge command prevents merging branch into itself."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            result = runner.invoke(app, ["merge", "main"])
-                            assert result.exit_code == 1
-                            assert "cannot merge branch into itself" in result.output
-
-    def test_merge_with_explicit_branch(self, initialized_project, tmp_path):
+        _patch_merge(mocker, initialized_project_ro)
+
+        exit_code, output = call_direct(merge, branch="main")
+        assert exit_code == 1
+        assert "cannot merge branch into itself" in output
+
+    def test_merge_with_explicit_branch(
+        self,
+        initialized_project_ro,
+        invoke,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
+    ):
         """Test merge command with explicitly provided branch."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.build_command.return_value = "echo merging"
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch("subprocess.run") as mock_run:
-                                mock_run.return_value = MagicMock(returncode=0)
-
-                                result = runner.invoke(app, ["merge", "feature"])
-                                assert result.exit_code == 0
-                                assert "Merging" in result.output
-                                assert "feature" in result.output
-                                assert "main" in result.output
-
-                                # Verify AI command was built correctly
-                                mock_config.ai.build_command.assert_called_once_with(
-                                    target_branch="feature", current_branch="main"
-                                )
-
-                                # Verify subprocess.run was called
-                                assert mock_run.called
+        _patch_merge(mocker, initialized_project_ro)
+
+        result = invoke(["merge", "feature"])
+        assert result.exit_code == 0
+        assert "Merging" in result.output
+        assert "feature" in result.output
+        assert "main" in result.output
+
+        # Verify AI command was built correctly
+        assert mock_user_config.ai.build_command.calls == [
+            call(target_branch="feature", current_branch="main")
+        ]
+
+        # Verify subprocess.run was called
+        assert fake_subprocess_run.calls
 
     def test_merge_interactive_branch_selection_no_branches(
-        self, initialized_project, tmp_path
+        self, initialized_project_ro, call_direct, mocker, mock_user_config
     ):
         """Test merge command interactive mode with no branches to merge."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_local_branches",
-                                return_value=["main"],
-                            ):
-                                result = runner.invoke(app, ["merge"])
-                                assert result.exit_code == 0
-                                assert "no branches to merge" in result.output
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_local_branches=MagicMock(return_value=["main"]),
+        )
+
+        exit_code, output = call_direct(merge)
+        assert exit_code == 0
+        assert "no branches to merge" in output
 
     def test_merge_interactive_branch_selection_git_error(
-        self, initialized_project, tmp_path
+        self, initialized_project_ro, call_direct, mocker, mock_user_config
     ):
         """Test merge command handles git errors during branch listing."""
-        from worktrees.git import GitError
-
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_local_branches",
-                                side_effect=GitError("branch error"),
-                            ):
-                                result = runner.invoke(app, ["merge"])
-                                assert result.exit_code == 1
-                                assert "branch error" in result.output
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_local_branches=MagicMock(side_effect=GitError("branch error")),
+        )
+
+        exit_code, output = call_direct(merge)
+        assert exit_code == 1
+        assert "branch error" in output
 
     def test_merge_interactive_branch_selection_user_cancels(
-        self, initialized_project, tmp_path
+        self, initialized_project_ro, call_direct, mocker, mock_user_config
     ):
         """Test merge command handles user canceling branch selection."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_local_branches",
-                                return_value=["main", "feature"],
-                            ):
-                                with patch("questionary.select") as mock_select:
-                                    mock_select.return_value.ask.return_value = None
-
-                                    result = runner.invoke(app, ["merge"])
-                                    assert result.exit_code == 0
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_local_branches=MagicMock(return_value=["main", "feature"]),
+        )
+        mock_select = mocker.patch("questionary.select")
+        mock_select.return_value.ask.return_value = None
+
+        exit_code, _ = call_direct(merge)
+        assert exit_code == 0
 
     def test_merge_interactive_branch_selection_success(
-        self, initialized_project, tmp_path
+        self,
+        initialized_project_ro,
+        invoke,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
     ):
         """Test merge command with successful interactive branch selection."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.build_command.return_value = "echo merging"
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_local_branches",
-                                return_value=["main", "feature", "develop"],
-                            ):
-                                with patch("questionary.select") as mock_select:
-                                    mock_select.return_value.ask.return_value = (
-                                        "feature"
-                                    )
-
-                                    with patch("subprocess.run") as mock_run:
-                                        mock_run.return_value = MagicMock(returncode=0)
-
-                                        result = runner.invoke(app, ["merge"])
-                                        assert result.exit_code == 0
-                                        assert "Merging" in result.output
-                                        assert "feature" in result.output
-
-                                        # Verify branch was used
-                                        mock_config.ai.build_command.assert_called_once_with(
-                                            target_branch="feature",
-                                            current_branch="main",
-                                        )
-
-    def test_merge_subprocess_nonzero_exit(self, initialized_project, tmp_path):
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_local_branches=MagicMock(return_value=["main", "feature", "develop"]),
+        )
+        mock_select = mocker.patch("questionary.select")
+        mock_select.return_value.ask.return_value = "feature"
+
+        result = invoke(["merge"])
+        assert result.exit_code == 0
+        assert "Merging" in result.output
+        assert "feature" in result.output
+
+        # Verify branch was used
+        assert mock_user_config.ai.build_command.calls == [
+            call(target_branch="feature", current_branch="main")
+        ]
+
+    def test_merge_subprocess_nonzero_exit(
+        self,
+        initialized_project_ro,
+        call_direct,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
+    ):
         """Test merge command propagates subprocess exit code."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.build_command.return_value = "exit 42"
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_worktrees", return_value=[]
-                            ):
-                                with patch("subprocess.run") as mock_run:
-                                    mock_run.return_value = MagicMock(returncode=42)
-
-                                    result = runner.invoke(app, ["merge", "feature"])
-                                    assert result.exit_code == 42
-
-    def test_merge_command_not_found(self, initialized_project, tmp_path):
+        mock_user_config.ai.build_command.ret = "exit 42"
+
+        _patch_merge(mocker, initialized_project_ro)
+        fake_subprocess_run.ret = _FAIL42
+
+        exit_code, _ = call_direct(merge, branch="feature")
+        assert exit_code == 42
+
+    def test_merge_command_not_found(
+        self,
+        initialized_project_ro,
+        call_direct,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
+    ):
         """Test merge command handles AI command not found."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.build_command.return_value = "/nonexistent/command"
-                    mock_config.ai.get_effective_command.return_value = (
-                        "/nonexistent/command"
-                    )
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_worktrees", return_value=[]
-                            ):
-                                with patch(
-                                    "subprocess.run", side_effect=FileNotFoundError()
-                                ):
-                                    result = runner.invoke(app, ["merge", "feature"])
-                                    assert result.exit_code == 1
-                                    assert "command not found" in result.output
+        mock_user_config.ai.build_command.ret = "/nonexistent/command"
+        mock_user_config.ai.command = "/nonexistent/command"
+
+        _patch_merge(mocker, initialized_project_ro)
+        fake_subprocess_run.error = FileNotFoundError()
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 1
+        assert "command not found" in output
 
     def test_merge_filters_current_branch_from_selection(
-        self, initialized_project, tmp_path
+        self,
+        initialized_project_ro,
+        call_direct,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
     ):
         """Test merge interactive selection excludes current branch."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "gemini"
-                    mock_config.ai.build_command.return_value = (
-                        "gemini -i 'merge feature'"
-                    )
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_local_branches",
-                                return_value=["main", "feature", "develop"],
-                            ):
-                                with patch("questionary.select") as mock_select:
-                                    mock_select.return_value.ask.return_value = (
-                                        "develop"
-                                    )
-
-                                    with patch("subprocess.run") as mock_run:
-                                        mock_run.return_value = MagicMock(returncode=0)
-
-                                        result = runner.invoke(app, ["merge"])
-                                        assert result.exit_code == 0
-
-                                        # Verify the select was called with choices that don't include "main"
-                                        call_args = mock_select.call_args
-                                        choices = call_args[1]["choices"]
-                                        choice_values = [c.value for c in choices]
-                                        assert "feature" in choice_values
-                                        assert "develop" in choice_values
-                                        assert "main" not in choice_values
-
-    def test_merge_uses_gemini_provider(self, initialized_project, tmp_path):
-        """Test merge command works with gemini provider."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "gemini"
-                    mock_config.ai.build_command.return_value = (
-                        "/usr/bin/gemini -i 'merge feature'"
-                    )
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch("subprocess.run") as mock_run:
-                                mock_run.return_value = MagicMock(returncode=0)
-
-                                result = runner.invoke(app, ["merge", "feature"])
-                                assert result.exit_code == 0
-                                assert "gemini" in result.output
+        mock_user_config.ai.provider = "gemini"
+        mock_user_config.ai.build_command.ret = "gemini -i 'merge feature'"
+
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_local_branches=MagicMock(return_value=["main", "feature", "develop"]),
+        )
+        mock_select = mocker.patch("questionary.select")
+        mock_select.return_value.ask.return_value = "develop"
+
+        exit_code, _ = call_direct(merge)
+        assert exit_code == 0
+
+        # Verify the select was called with choices that don't include "main"
+        call_args = mock_select.call_args
+        choices = call_args[1]["choices"]
+        choice_values = [c.value for c in choices]
+        assert "feature" in choice_values
+        assert "develop" in choice_values
+        assert "main" not in choice_values
+
+    @pytest.mark.parametrize(
+        "provider, built_command",
+        [
+            ("claude", "claude 'merge feature'"),
+            ("gemini", "/usr/bin/gemini -i 'merge feature'"),
+        ],
+    )
+    def test_merge_uses_provider(
+        self,
+        initialized_project_ro,
+        call_direct,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
+        provider,
+        built_command,
+    ):
+        """Test merge command works with each supported provider."""
+        mock_user_config.ai.provider = provider
+        mock_user_config.ai.build_command.ret = built_command
+
+        _patch_merge(mocker, initialized_project_ro)
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 0
+        assert provider in output
 
     def test_merge_fails_if_source_has_uncommitted_changes(
-        self, initialized_project, tmp_path
+        self,
+        initialized_project_ro,
+        main_and_feature_worktrees,
+        call_direct,
+        mocker,
+        mock_user_config,
     ):
         """Test merge fails when source branch worktree has uncommitted changes."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        feature_worktree = initialized_project / "feature"
-        feature_worktree.mkdir()
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_worktrees"
-                            ) as mock_list_wt:
-                                mock_list_wt.return_value = [
-                                    Worktree(
-                                        path=initialized_project / "main",
-                                        branch="main",
-                                        commit="abc123",
-                                    ),
-                                    Worktree(
-                                        path=feature_worktree,
-                                        branch="feature",
-                                        commit="def456",
-                                    ),
-                                ]
-                                with patch(
-                                    "worktrees.cli.advanced.has_uncommitted_changes",
-                                    return_value=True,
-                                ):
-                                    result = runner.invoke(app, ["merge", "feature"])
-                                    assert result.exit_code == 1
-                                    assert "uncommitted changes" in result.output
-                                    assert "feature" in result.output
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_worktrees=MagicMock(return_value=list(main_and_feature_worktrees)),
+            has_uncommitted_changes=MagicMock(return_value=True),
+        )
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 1
+        assert "uncommitted changes" in output
+        assert "feature" in output
 
     def test_merge_succeeds_if_source_has_no_uncommitted_changes(
-        self, initialized_project, tmp_path
+        self,
+        initialized_project_ro,
+        main_and_feature_worktrees,
+        call_direct,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
     ):
         """Test merge succeeds when source branch worktree is clean."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        feature_worktree = initialized_project / "feature"
-        feature_worktree.mkdir()
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.build_command.return_value = "echo merging"
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_worktrees"
-                            ) as mock_list_wt:
-                                mock_list_wt.return_value = [
-                                    Worktree(
-                                        path=initialized_project / "main",
-                                        branch="main",
-                                        commit="abc123",
-                                    ),
-                                    Worktree(
-                                        path=feature_worktree,
-                                        branch="feature",
-                                        commit="def456",
-                                    ),
-                                ]
-                                with patch(
-                                    "worktrees.cli.advanced.has_uncommitted_changes",
-                                    return_value=False,
-                                ):
-                                    with patch("subprocess.run") as mock_run:
-                                        mock_run.return_value = MagicMock(returncode=0)
-
-                                        result = runner.invoke(
-                                            app, ["merge", "feature"]
-                                        )
-                                        assert result.exit_code == 0
-                                        assert "Merging" in result.output
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_worktrees=MagicMock(return_value=list(main_and_feature_worktrees)),
+            has_uncommitted_changes=MagicMock(return_value=False),
+        )
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 0
+        assert "Merging" in output
 
     def test_merge_proceeds_if_source_branch_has_no_worktree(
-        self, initialized_project, tmp_path
+        self,
+        initialized_project_ro,
+        call_direct,
+        mocker,
+        mock_user_config,
+        fake_subprocess_run,
+        main_worktree,
     ):
         """Test merge proceeds when source branch has no worktree (remote only)."""
-        config_file = tmp_path / "config.json"
-        config_file.write_text("{}")
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.user_config.UserConfig.load") as mock_load:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.build_command.return_value = "echo merging"
-                    mock_load.return_value = mock_config
-
-                    with patch(
-                        "worktrees.cli.advanced.is_valid_worktree", return_value=True
-                    ):
-                        with patch(
-                            "worktrees.cli.advanced.get_current_branch",
-                            return_value="main",
-                        ):
-                            with patch(
-                                "worktrees.cli.advanced.list_worktrees"
-                            ) as mock_list_wt:
-                                # Only main worktree exists, feature branch has no worktree
-                                mock_list_wt.return_value = [
-                                    Worktree(
-                                        path=initialized_project / "main",
-                                        branch="main",
-                                        commit="abc123",
-                                    ),
-                                ]
-                                with patch("subprocess.run") as mock_run:
-                                    mock_run.return_value = MagicMock(returncode=0)
-
-                                    result = runner.invoke(app, ["merge", "feature"])
-                                    assert result.exit_code == 0
-                                    assert "Merging" in result.output
+        _patch_merge(
+            mocker,
+            initialized_project_ro,
+            list_worktrees=MagicMock(
+                return_value=[
+                    main_worktree(initialized_project_ro),
+                ]
+            ),
+        )
+
+        exit_code, output = call_direct(merge, branch="feature")
+        assert exit_code == 0
+        assert "Merging" in output
@@ -1,473 +1,202 @@
 """Tests for config CLI command."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT
 
+import pytest
 from typer.testing import CliRunner
 
 from worktrees.cli import app
 from worktrees.user_config import DEFAULT_PROMPT, PROVIDER_DEFAULTS
 
+pytestmark = pytest.mark.xdist_group("cli_mocks")
+
 runner = CliRunner()
 
+_CLAUDE_DEFAULT_CMD = PROVIDER_DEFAULTS["claude"]["command"]
+_GEMINI_DEFAULT_CMD = PROVIDER_DEFAULTS["gemini"]["command"]
+
+
+@pytest.fixture(autouse=True)
+def user_config(mock_user_config):
+    """Stub UserConfig.load for every test, starting from an unconfigured state."""
+    mock_user_config.configured = False
+    return mock_user_config
+
+
+@pytest.fixture
+def prompts(mocker):
+    """Patch the questionary prompts used by the wizard in a single call."""
+    return mocker.patch.multiple(
+        "questionary", select=DEFAULT, text=DEFAULT, confirm=DEFAULT
+    )
+
 
 class TestConfigCommand:
     """Tests for the config command."""
 
-    def test_config_creates_new_config(self, tmp_path):
+    def test_config_creates_new_config(self, prompts):
         """Test config command creates new config file."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                mock_select.return_value.ask.return_value = "claude"
-                                mock_text.return_value.ask.return_value = ""
-                                mock_confirm.return_value.ask.return_value = (
-                                    True  # Use default prompt
-                                )
-
-                                result = runner.invoke(app, ["config"])
-                                assert result.exit_code == 0
-                                assert "Configuration saved" in result.output
-
-    def test_config_shows_current_settings(self, tmp_path):
+        prompts["select"].return_value.ask.return_value = "claude"
+        prompts["text"].return_value.ask.return_value = ""
+        prompts["confirm"].return_value.ask.return_value = True  # Use default prompt
+
+        result = runner.invoke(app, ["config"])
+        assert result.exit_code == 0
+        assert "Configuration saved" in result.output
+        assert _CLAUDE_DEFAULT_CMD in result.output
+
+    def test_config_shows_current_settings(self, user_config, prompts):
         """Test config command shows current settings when configured."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = True
-                    mock_config.ai.provider = "gemini"
-                    mock_config.ai.command = "/custom/gemini"
-                    mock_config.ai.prompt = "custom prompt"
-                    mock_config.ai.get_effective_command.return_value = "/custom/gemini"
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                mock_select.return_value.ask.return_value = "gemini"
-                                mock_text.return_value.ask.return_value = ""
-                                mock_confirm.return_value.ask.return_value = (
-                                    True  # Use default prompt
-                                )
-
-                                result = runner.invoke(app, ["config"])
-                                assert result.exit_code == 0
-                                assert "Current configuration" in result.output
-                                assert "gemini" in result.output
-
-    def test_config_user_cancels_provider(self, tmp_path):
-        """Test config command exits gracefully when user cancels provider selection."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        mock_select.return_value.ask.return_value = None
-
-                        result = runner.invoke(app, ["config"])
-                        assert result.exit_code == 0
-                        assert "Configuration saved" not in result.output
-
-    def test_config_user_cancels_command(self, tmp_path):
-        """Test config command exits when user cancels command input."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            mock_select.return_value.ask.return_value = "claude"
-                            mock_text.return_value.ask.return_value = None
-
-                            result = runner.invoke(app, ["config"])
-                            assert result.exit_code == 0
-
-    def test_config_custom_prompt(self, tmp_path):
+        user_config.configured = True
+        user_config.ai.provider = "gemini"
+        user_config.ai.command = "/custom/gemini"
+        user_config.ai.prompt = "custom prompt"
+
+        prompts["select"].return_value.ask.return_value = "gemini"
+        prompts["text"].return_value.ask.return_value = ""
+        prompts["confirm"].return_value.ask.return_value = True  # Use default prompt
+
+        result = runner.invoke(app, ["config"])
+        assert result.exit_code == 0
+        assert "Current configuration" in result.output
+        assert "gemini" in result.output
+
+    @pytest.mark.parametrize("cancel_at", ["select", "text", "confirm"])
+    def test_config_user_cancels(self, user_config, cancel_at, prompts):
+        """Test config command exits without saving when any prompt is cancelled."""
+        answers = {"select": "claude", "text": "", "confirm": True}
+        answers[cancel_at] = None
+
+        prompts["select"].return_value.ask.return_value = answers["select"]
+        prompts["text"].return_value.ask.return_value = answers["text"]
+        prompts["confirm"].return_value.ask.return_value = answers["confirm"]
+
+        result = runner.invoke(app, ["config"])
+        assert result.exit_code == 0
+        assert "Configuration saved" not in result.output
+        assert user_config.saves == 0
+
+    def test_config_custom_prompt(self, user_config, prompts, mocker):
         """Test config command with custom prompt."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                with patch("click.edit") as mock_edit:
-                                    mock_select.return_value.ask.return_value = "claude"
-                                    mock_text.return_value.ask.return_value = (
-                                        ""  # Command
-                                    )
-                                    mock_confirm.return_value.ask.return_value = (
-                                        False  # Don't use default prompt
-                                    )
-                                    mock_edit.return_value = "my custom prompt"
-
-                                    result = runner.invoke(app, ["config"])
-                                    assert result.exit_code == 0
-                                    mock_config.save.assert_called_once()
-
-    def test_config_user_cancels_custom_prompt_confirm(self, tmp_path):
-        """Test config command exits when user cancels custom prompt confirmation."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                mock_select.return_value.ask.return_value = "claude"
-                                mock_text.return_value.ask.return_value = ""
-                                mock_confirm.return_value.ask.return_value = None
-
-                                result = runner.invoke(app, ["config"])
-                                assert result.exit_code == 0
-
-    def test_config_user_cancels_custom_prompt_editor(self, tmp_path):
+        prompts["select"].return_value.ask.return_value = "claude"
+        prompts["text"].return_value.ask.return_value = ""  # Command
+        prompts["confirm"].return_value.ask.return_value = False  # Don't use default
+        mocker.patch("click.edit", return_value="my custom prompt")
+
+        result = runner.invoke(app, ["config"])
+        assert result.exit_code == 0
+        assert user_config.saves == 1
+
+    def test_config_user_cancels_custom_prompt_editor(self, prompts, mocker):
         """Test config command keeps existing prompt when user cancels editor."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                with patch("click.edit") as mock_edit:
-                                    mock_select.return_value.ask.return_value = "claude"
-                                    mock_text.return_value.ask.return_value = (
-                                        ""  # Command
-                                    )
-                                    mock_confirm.return_value.ask.return_value = (
-                                        False  # Don't use default
-                                    )
-                                    mock_edit.return_value = None  # Editor cancelled
-
-                                    result = runner.invoke(app, ["config"])
-                                    assert result.exit_code == 0
-                                    assert "Keeping existing prompt" in result.output
-
-    def test_config_custom_prompt_empty_falls_back_to_default(self, tmp_path):
+        prompts["select"].return_value.ask.return_value = "claude"
+        prompts["text"].return_value.ask.return_value = ""  # Command
+        prompts["confirm"].return_value.ask.return_value = False  # Don't use default
+        mocker.patch("click.edit", return_value=None)  # Editor cancelled
+
+        result = runner.invoke(app, ["config"])
+        assert result.exit_code == 0
+        assert "Keeping existing prompt" in result.output
+
+    def test_config_custom_prompt_empty_falls_back_to_default(
+        self, user_config, prompts, mocker
+    ):
         """Test config command falls back to default prompt when user provides empty text."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.is_configured.return_value = False
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                with patch("click.edit") as mock_edit:
-                                    mock_select.return_value.ask.return_value = "claude"
-                                    mock_text.return_value.ask.return_value = (
-                                        ""  # Command
-                                    )
-                                    mock_confirm.return_value.ask.return_value = (
-                                        False  # Don't use default
-                                    )
-                                    mock_edit.return_value = (
-                                        "   \n\n   "  # Empty/whitespace
-                                    )
-
-                                    result = runner.invoke(app, ["config"])
-                                    assert result.exit_code == 0
-                                    # Verify it saved the default prompt when empty was provided
-                                    assert mock_config.ai.prompt == DEFAULT_PROMPT
-                                    mock_config.save.assert_called_once()
+        prompts["select"].return_value.ask.return_value = "claude"
+        prompts["text"].return_value.ask.return_value = ""  # Command
+        prompts["confirm"].return_value.ask.return_value = False  # Don't use default
+        mocker.patch("click.edit", return_value="   \n\n   ")  # Empty/whitespace
+
+        result = runner.invoke(app, ["config"])
+        assert result.exit_code == 0
+        # Verify it saved the default prompt when empty was provided
+        assert user_config.ai.prompt == DEFAULT_PROMPT
+        assert user_config.saves == 1
 
 
 class TestConfigNonInteractive:
     """Tests for non-interactive config options (--provider, --command, --prompt, --default-prompt)."""
 
-    def test_config_provider_only(self, tmp_path):
+    def test_config_provider_only(self, user_config, prompts):
         """Test --provider claude sets provider and saves without questionary."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                result = runner.invoke(
-                                    app, ["config", "--provider", "claude"]
-                                )
-                                assert result.exit_code == 0
-                                assert mock_config.ai.provider == "claude"
-                                mock_config.save.assert_called_once()
-                                assert "Configuration saved" in result.output
-                                mock_select.assert_not_called()
-                                mock_text.assert_not_called()
-                                mock_confirm.assert_not_called()
-
-    def test_config_provider_gemini(self, tmp_path):
+        result = runner.invoke(app, ["config", "--provider", "claude"])
+        assert result.exit_code == 0
+        assert user_config.ai.provider == "claude"
+        assert user_config.saves == 1
+        assert "Configuration saved" in result.output
+        prompts["select"].assert_not_called()
+        prompts["text"].assert_not_called()
+        prompts["confirm"].assert_not_called()
+
+    def test_config_provider_gemini(self, user_config):
         """Test --provider gemini sets provider to gemini."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(
-                        app, ["config", "--provider", "gemini"]
-                    )
-                    assert result.exit_code == 0
-                    assert mock_config.ai.provider == "gemini"
-                    mock_config.save.assert_called_once()
-
-    def test_config_invalid_provider(self, tmp_path):
+        result = runner.invoke(app, ["config", "--provider", "gemini"])
+        assert result.exit_code == 0
+        assert user_config.ai.provider == "gemini"
+        assert user_config.saves == 1
+        assert _GEMINI_DEFAULT_CMD in result.output
+
+    def test_config_invalid_provider(self, user_config):
         """Test --provider invalid shows error and exits with code 1."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(
-                        app, ["config", "--provider", "invalid"]
-                    )
-                    assert result.exit_code == 1
-                    assert "unknown provider" in result.output
-                    mock_config.save.assert_not_called()
-
-    def test_config_command_only(self, tmp_path):
+        result = runner.invoke(app, ["config", "--provider", "invalid"])
+        assert result.exit_code == 1
+        assert "unknown provider" in result.output
+        assert user_config.saves == 0
+
+    def test_config_command_only(self, user_config):
         """Test --command sets the AI command path."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        "/usr/bin/claude"
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(
-                        app, ["config", "--command", "/usr/bin/claude"]
-                    )
-                    assert result.exit_code == 0
-                    assert mock_config.ai.command == "/usr/bin/claude"
-                    mock_config.save.assert_called_once()
-
-    def test_config_default_prompt(self, tmp_path):
+        result = runner.invoke(app, ["config", "--command", "/usr/bin/claude"])
+        assert result.exit_code == 0
+        assert user_config.ai.command == "/usr/bin/claude"
+        assert user_config.saves == 1
+
+    def test_config_default_prompt(self, user_config):
         """Test --default-prompt sets prompt to DEFAULT_PROMPT."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = "some old custom prompt"
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(app, ["config", "--default-prompt"])
-                    assert result.exit_code == 0
-                    assert mock_config.ai.prompt == DEFAULT_PROMPT
-                    mock_config.save.assert_called_once()
-
-    def test_config_custom_prompt(self, tmp_path):
+        user_config.ai.prompt = "some old custom prompt"
+
+        result = runner.invoke(app, ["config", "--default-prompt"])
+        assert result.exit_code == 0
+        assert user_config.ai.prompt == DEFAULT_PROMPT
+        assert user_config.saves == 1
+
+    def test_config_custom_prompt(self, user_config):
         """Test --prompt sets a custom prompt."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(
-                        app, ["config", "--prompt", "my custom prompt"]
-                    )
-                    assert result.exit_code == 0
-                    assert mock_config.ai.prompt == "my custom prompt"
-                    mock_config.save.assert_called_once()
-
-    def test_config_prompt_and_default_prompt_exclusive(self, tmp_path):
+        result = runner.invoke(app, ["config", "--prompt", "my custom prompt"])
+        assert result.exit_code == 0
+        assert user_config.ai.prompt == "my custom prompt"
+        assert user_config.saves == 1
+
+    def test_config_prompt_and_default_prompt_exclusive(self, user_config):
         """Test --prompt and --default-prompt together produce a mutually exclusive error."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(
-                        app,
-                        ["config", "--prompt", "x", "--default-prompt"],
-                    )
-                    assert result.exit_code == 1
-                    assert "mutually exclusive" in result.output
-                    mock_config.save.assert_not_called()
-
-    def test_config_multiple_options(self, tmp_path):
+        result = runner.invoke(
+            app,
+            ["config", "--prompt", "x", "--default-prompt"],
+        )
+        assert result.exit_code == 1
+        assert "mutually exclusive" in result.output
+        assert user_config.saves == 0
+
+    def test_config_multiple_options(self, user_config):
         """Test --provider and --command together updates both fields."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = "/bin/gemini"
-                    mock_config_cls.load.return_value = mock_config
-
-                    result = runner.invoke(
-                        app,
-                        [
-                            "config",
-                            "--provider",
-                            "gemini",
-                            "--command",
-                            "/bin/gemini",
-                        ],
-                    )
-                    assert result.exit_code == 0
-                    assert mock_config.ai.provider == "gemini"
-                    assert mock_config.ai.command == "/bin/gemini"
-                    mock_config.save.assert_called_once()
-
-    def test_config_no_questionary_in_non_interactive(self, tmp_path):
+        result = runner.invoke(
+            app,
+            [
+                "config",
+                "--provider",
+                "gemini",
+                "--command",
+                "/bin/gemini",
+            ],
+        )
+        assert result.exit_code == 0
+        assert user_config.ai.provider == "gemini"
+        assert user_config.ai.command == "/bin/gemini"
+        assert user_config.saves == 1
+
+    def test_config_no_questionary_in_non_interactive(self, prompts):
         """Test non-interactive mode never calls questionary."""
-        config_dir = tmp_path / ".config" / "worktrees"
-        config_file = config_dir / "config.json"
-
-        with patch("worktrees.user_config.GLOBAL_CONFIG_DIR", config_dir):
-            with patch("worktrees.user_config.GLOBAL_CONFIG_FILE", config_file):
-                with patch("worktrees.cli.config_cmd.UserConfig") as mock_config_cls:
-                    mock_config = MagicMock()
-                    mock_config.ai.provider = "claude"
-                    mock_config.ai.command = ""
-                    mock_config.ai.prompt = DEFAULT_PROMPT
-                    mock_config.ai.get_effective_command.return_value = (
-                        PROVIDER_DEFAULTS["claude"]["command"]
-                    )
-                    mock_config_cls.load.return_value = mock_config
-
-                    with patch("questionary.select") as mock_select:
-                        with patch("questionary.text") as mock_text:
-                            with patch("questionary.confirm") as mock_confirm:
-                                result = runner.invoke(
-                                    app, ["config", "--provider", "claude"]
-                                )
-                                assert result.exit_code == 0
-                                mock_select.assert_not_called()
-                                mock_text.assert_not_called()
-                                mock_confirm.assert_not_called()
+        result = runner.invoke(app, ["config", "--provider", "claude"])
+        assert result.exit_code == 0
+        prompts["select"].assert_not_called()
+        prompts["text"].assert_not_called()
+        prompts["confirm"].assert_not_called()
@@ -1,516 +1,336 @@
 """Tests for CLI __init__ module functions."""
 
-import json
+import functools
+import io
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import call
 
 import pytest
-from typer.testing import CliRunner
-
-from worktrees.cli import (
-    STYLE,
-    app,
-    decode_branch_name,
-    encode_branch_name,
-    show_worktree_list,
-)
-from worktrees.config import WORKTREES_JSON
+import typer
+from prompt_toolkit.styles import Style
+
+import worktrees.cli.init_clone as ic
+from worktrees import cli
+from worktrees.cli import STYLE, app, main, require_initialized, show_worktree_list
+from worktrees.config import WorktreesConfig
 from worktrees.git import GitError, Worktree
 
-runner = CliRunner()
+_CMD_ROOT = ()
+_CMD_STATUS = ("status",)
 
+_GIT_ERR = GitError("test error")
 
-@pytest.fixture
-def initialized_project(tmp_path):
-    """Create an initialized worktrees project."""
-    config_file = tmp_path / WORKTREES_JSON
-    config_file.write_text(
-        json.dumps(
-            {
-                "version": "1.0",
-                "worktreesDir": ".",
-                "setup": {"autoDetect": True, "commands": []},
-                "marks": {},
-            }
-        )
-    )
-    return tmp_path
 
+def _feature_worktree(root):
+    """Build the feature worktree entry for a project rooted at *root*."""
+    return Worktree(path=root / "feature", branch="feature", commit="abc123")
 
-class TestRequireInitialized:
-    """Tests for the require_initialized() function."""
 
-    def test_require_initialized_success(self, initialized_project):
-        """Test require_initialized returns config when project is initialized."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            # Test via CLI command that uses require_initialized
-            result = runner.invoke(app, ["status"])
-            # Status will work or fail based on initialization
-            assert result.exit_code in [0, 1]  # Either success or controlled exit
+@pytest.fixture(scope="session")
+def load_config():
+    """Return WorktreesConfig.load memoized per project root.
 
-    def test_require_initialized_no_project_root(self, tmp_path):
-        """Test require_initialized exits when no project root found."""
-        with patch("worktrees.config.Path.cwd", return_value=tmp_path):
-            # Test via CLI - status command uses require_initialized
-            result = runner.invoke(app, ["status"])
-            assert result.exit_code == 1
-            assert "not initialized" in result.output
+    The returned configs are shared, so tests must not mutate them.
+    """
+    return functools.lru_cache(maxsize=4)(WorktreesConfig.load)
 
-    def test_require_initialized_no_config_file(self, tmp_path):
-        """Test require_initialized exits when config file doesn't exist."""
-        with patch("worktrees.config.Path.cwd", return_value=tmp_path):
-            # Test via CLI - status command uses require_initialized
-            result = runner.invoke(app, ["status"])
-            assert result.exit_code == 1
-            assert "not initialized" in result.output
-
-
-class TestEncodeBranchName:
-    """Tests for the encode_branch_name() function."""
-
-    def test_encode_simple(self):
-        """Test encoding a simple branch name (no slashes)."""
-        assert encode_branch_name("main") == "main"
-
-    def test_encode_with_slash(self):
-        """Test encoding a branch with a single slash."""
-        assert encode_branch_name("feat/my-feature") == "feat-slash-my-feature"
-
-    def test_encode_multiple_slashes(self):
-        """Test encoding a branch with multiple slashes."""
-        assert (
-            encode_branch_name("category/subcategory/feature")
-            == "category-slash-subcategory-slash-feature"
-        )
-
-    def test_encode_trailing_slash(self):
-        """Test encoding a branch with trailing slash (stripped)."""
-        assert encode_branch_name("feat/feature/") == "feat-slash-feature"
-
-    def test_encode_empty(self):
-        """Test encoding an empty string."""
-        assert encode_branch_name("") == ""
-
-
-class TestDecodeBranchName:
-    """Tests for the decode_branch_name() function."""
-
-    def test_decode_simple(self):
-        """Test decoding a simple name (no -slash- tokens)."""
-        assert decode_branch_name("main") == "main"
-
-    def test_decode_with_slash(self):
-        """Test decoding a name with a single -slash- token."""
-        assert decode_branch_name("feat-slash-my-feature") == "feat/my-feature"
-
-    def test_decode_multiple_slashes(self):
-        """Test decoding a name with multiple -slash- tokens."""
-        assert (
-            decode_branch_name("category-slash-subcategory-slash-feature")
-            == "category/subcategory/feature"
-        )
-
-    def test_decode_empty(self):
-        """Test decoding an empty string."""
-        assert decode_branch_name("") == ""
-
-
-class TestBranchNameRoundTrip:
-    """Tests for encode/decode round-trip consistency."""
-
-    @pytest.mark.parametrize(
-        "branch",
-        [
-            "main",
-            "feat/my-feature",
-            "category/subcategory/feature",
-            "release/v2.0",
-            "a/b/c",
-            "",
-        ],
-    )
-    def test_round_trip(self, branch):
-        """Test that decode(encode(branch)) == branch."""
-        assert decode_branch_name(encode_branch_name(branch)) == branch
 
+@pytest.fixture(autouse=True)
+def _chdir_to_marked_fixture(request, monkeypatch):
+    """Change into the directory of the fixture named by a ``cwd`` marker."""
+    marker = request.node.get_closest_marker("cwd")
+    if marker is not None:
+        monkeypatch.chdir(request.getfixturevalue(marker.args[0]))
 
-class TestShowWorktreeList:
-    """Tests for the show_worktree_list() function."""
 
-    def test_show_worktree_list_handles_git_error(self, initialized_project, capsys):
-        """Test show_worktree_list handles GitError."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
+@pytest.fixture(scope="module")
+def initialized_project_with_marks(tmp_path_factory, write_config):
+    """Create a project whose config marks the feature worktree, once per module."""
+    project = tmp_path_factory.mktemp("project_marks")
+    write_config(project, marks={"feature": "important"})
+    return project
 
-            config = WorktreesConfig.load(initialized_project)
 
-            with patch(
-                "worktrees.cli.list_worktrees", side_effect=GitError("test error")
-            ):
-                show_worktree_list(config, use_stderr=True)
+@pytest.fixture(scope="session")
+def loaded_config(load_config, initialized_project_ro):
+    """Return the config of the shared read-only project."""
+    return load_config(initialized_project_ro)
 
-                captured = capsys.readouterr()
-                assert "error" in captured.err
-                assert "test error" in captured.err
 
-    def test_show_worktree_list_empty(self, initialized_project, capsys):
-        """Test show_worktree_list with no worktrees."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
+class TestRequireInitialized:
+    """Tests for the require_initialized() function."""
 
-            config = WorktreesConfig.load(initialized_project)
+    @pytest.mark.cwd("initialized_project_ro")
+    def test_require_initialized_success(self, initialized_project_ro):
+        """Test require_initialized returns config when project is initialized."""
+        config = require_initialized()
 
-            with patch("worktrees.cli.list_worktrees", return_value=[]):
-                show_worktree_list(config, use_stderr=False)
+        assert config.project_root == initialized_project_ro
 
-                captured = capsys.readouterr()
-                # Should output table header
-                assert "name" in captured.out or "branch" in captured.out
+    @pytest.mark.cwd("tmp_path")
+    def test_require_initialized_no_project_root(self, capsys):
+        """Test require_initialized exits when no project root found."""
+        with pytest.raises(typer.Exit) as exc:
+            require_initialized()
 
-    def test_show_worktree_list_with_worktrees(self, initialized_project, capsys):
-        """Test show_worktree_list displays worktrees."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
+        assert exc.value.exit_code == 1
+        assert "not initialized" in capsys.readouterr().err
+
+    def test_require_initialized_no_config_file(self, tmp_path, capsys, monkeypatch):
+        """Test require_initialized exits when config file doesn't exist."""
+        monkeypatch.setattr(cli, "find_project_root", lambda: tmp_path)
+        with pytest.raises(typer.Exit) as exc:
+            require_initialized()
+
+        assert exc.value.exit_code == 1
+        assert "not initialized" in capsys.readouterr().err
+
+    @pytest.mark.cwd("tmp_path")
+    def test_require_initialized_via_command(self, invoke):
+        """Test a command that uses require_initialized exits when not initialized."""
+        result = invoke(_CMD_STATUS)
+        assert result.exit_code == 1
+        assert "not initialized" in result.stderr
+
+
+class _StatPath:
+    """Path stand-in with a fixed name and creation time, so nothing touches disk."""
+
+    def __init__(self, name, ctime):
+        self.name = name
+        self._stat = SimpleNamespace(st_ctime=ctime)
+
+    def stat(self):
+        return self._stat
+
+
+@contextmanager
+def fast_capture():
+    """Redirect stdout/stderr to StringIO buffers, yielding (out, err)."""
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        yield out, err
+
+
+# Worktree lists keyed by shape, built under a given project root with the
+# main_worktree factory fixture
+_WORKTREE_SHAPES = {
+    "empty": lambda root, main_worktree: [],
+    "main": lambda root, main_worktree: [main_worktree(root)],
+    "main_and_feature": lambda root, main_worktree: [
+        main_worktree(root),
+        Worktree(path=root / "feature", branch="feature", commit="def456"),
+    ],
+    "bare": lambda root, main_worktree: [
+        Worktree(path=root, branch="(bare)", commit="abc123")
+    ],
+    "missing_path": lambda root, main_worktree: [
+        Worktree(path=root / "nonexistent", branch="feature", commit="abc123")
+    ],
+    "detached": lambda root, main_worktree: [
+        Worktree(path=root / "detached", branch=None, commit="abc123")
+    ],
+}
+
+# (shape, expected output, use_stderr)
+_SHOW_CASES = [
+    pytest.param("empty", ["name", "branch"], False, id="empty"),
+    pytest.param(
+        "main_and_feature", ["main", "feature", "def456"], False, id="with_worktrees"
+    ),
+    pytest.param("bare", ["(bare)"], False, id="bare_repo"),
+    pytest.param("missing_path", ["feature"], False, id="missing_path"),
+    pytest.param("detached", ["(detached)"], False, id="detached"),
+    pytest.param("main", ["main"], True, id="uses_stderr"),
+]
 
-            config = WorktreesConfig.load(initialized_project)
 
-            worktrees = [
-                Worktree(
-                    path=initialized_project / "main", branch="main", commit="abc123"
-                ),
-                Worktree(
-                    path=initialized_project / "feature",
-                    branch="feature",
-                    commit="def456",
-                ),
-            ]
+class TestShowWorktreeList:
+    """Tests for the show_worktree_list() function."""
 
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=False)
+    def test_show_worktree_list_handles_git_error(self, loaded_config, monkeypatch):
+        """Test show_worktree_list handles GitError."""
 
-                captured = capsys.readouterr()
-                assert "main" in captured.out
-                assert "feature" in captured.out
-                assert "abc123" in captured.out
+        def _list_worktrees(_):
+            raise _GIT_ERR
 
-    def test_show_worktree_list_with_bare_repo(self, initialized_project, capsys):
-        """Test show_worktree_list displays bare repo specially."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
+        monkeypatch.setattr(cli, "list_worktrees", _list_worktrees)
+        with fast_capture() as (_, err):
+            show_worktree_list(loaded_config, use_stderr=True)
 
-            config = WorktreesConfig.load(initialized_project)
+        assert "error" in err.getvalue()
+        assert "test error" in err.getvalue()
 
-            worktrees = [
-                Worktree(path=initialized_project, branch="(bare)", commit="abc123"),
-            ]
+    @pytest.mark.parametrize(("shape", "expected", "use_stderr"), _SHOW_CASES)
+    def test_show_worktree_list(
+        self, loaded_config, monkeypatch, main_worktree, shape, expected, use_stderr
+    ):
+        """Test show_worktree_list renders each worktree row to the chosen stream."""
+        worktrees = _WORKTREE_SHAPES[shape](loaded_config.project_root, main_worktree)
+        monkeypatch.setattr(cli, "list_worktrees", lambda _: worktrees)
 
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=False)
+        with fast_capture() as (out, err):
+            show_worktree_list(loaded_config, use_stderr=use_stderr)
 
-                captured = capsys.readouterr()
-                assert "(bare)" in captured.out
+        output = (err if use_stderr else out).getvalue()
+        for text in expected:
+            assert text in output
 
-    def test_show_worktree_list_with_marks(self, initialized_project, capsys):
+    def test_show_worktree_list_with_marks(
+        self, load_config, initialized_project_with_marks, monkeypatch
+    ):
         """Test show_worktree_list displays marks."""
-        # Add marks to config
-        config_file = initialized_project / WORKTREES_JSON
-        config_file.write_text(
-            json.dumps(
-                {
-                    "version": "1.0",
-                    "worktreesDir": ".",
-                    "setup": {"autoDetect": True, "commands": []},
-                    "marks": {"feature": "important"},
-                }
-            )
-        )
-
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
-
-            config = WorktreesConfig.load(initialized_project)
-
-            worktrees = [
-                Worktree(
-                    path=initialized_project / "feature",
-                    branch="feature",
-                    commit="abc123",
-                ),
-            ]
-
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=False)
-
-                captured = capsys.readouterr()
-                assert "important" in captured.out
-
-    def test_show_worktree_list_sorted_by_creation(self, initialized_project, capsys):
-        """Test show_worktree_list sorts by creation time."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
-
-            config = WorktreesConfig.load(initialized_project)
-
-            bare_path = initialized_project / "bare"
-            main_path = initialized_project / "main"
-            feature_path = initialized_project / "feature"
-
-            # Create paths with different creation times
-            bare_path.mkdir()
-            main_path.mkdir()
-            feature_path.mkdir()
-
-            worktrees = [
-                Worktree(path=feature_path, branch="feature", commit="def456"),
-                Worktree(path=bare_path, branch="(bare)", commit="abc123"),
-                Worktree(path=main_path, branch="main", commit="ghi789"),
-            ]
-
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=False)
-
-                captured = capsys.readouterr()
-                # Bare should be first, then others by creation time
-                assert "(bare)" in captured.out
-
-    def test_show_worktree_list_handles_missing_path(self, initialized_project, capsys):
-        """Test show_worktree_list handles missing worktree path."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
-
-            config = WorktreesConfig.load(initialized_project)
-
-            worktrees = [
-                Worktree(
-                    path=initialized_project / "nonexistent",
-                    branch="feature",
-                    commit="abc123",
-                ),
-            ]
-
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=False)
-
-                captured = capsys.readouterr()
-                # Should not crash
-                assert "feature" in captured.out
-
-    def test_show_worktree_list_detached_branch(self, initialized_project, capsys):
-        """Test show_worktree_list shows detached HEAD."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
-
-            config = WorktreesConfig.load(initialized_project)
-
-            worktrees = [
-                Worktree(
-                    path=initialized_project / "detached", branch=None, commit="abc123"
-                ),
-            ]
-
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=False)
-
-                captured = capsys.readouterr()
-                assert "(detached)" in captured.out
-
-    def test_show_worktree_list_uses_stderr(self, initialized_project, capsys):
-        """Test show_worktree_list can output to stderr."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            from worktrees.config import WorktreesConfig
+        config = load_config(initialized_project_with_marks)
+
+        worktrees = [_feature_worktree(initialized_project_with_marks)]
+
+        monkeypatch.setattr(cli, "list_worktrees", lambda _: worktrees)
+        with fast_capture() as (out, _):
+            show_worktree_list(config, use_stderr=False)
 
-            config = WorktreesConfig.load(initialized_project)
+        assert "important" in out.getvalue()
 
-            worktrees = [
-                Worktree(
-                    path=initialized_project / "main", branch="main", commit="abc123"
-                ),
-            ]
+    def test_show_worktree_list_sorted_by_creation(self, loaded_config, monkeypatch):
+        """Test show_worktree_list sorts by creation time, bare repo first."""
+        worktrees = [
+            Worktree(path=_StatPath("feature", 2.0), branch="feature", commit="def456"),
+            Worktree(path=_StatPath("bare", 3.0), branch="(bare)", commit="abc123"),
+            Worktree(path=_StatPath("main", 1.0), branch="main", commit="ghi789"),
+        ]
 
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                show_worktree_list(config, use_stderr=True)
+        monkeypatch.setattr(cli, "list_worktrees", lambda _: worktrees)
+        with fast_capture() as (out, _):
+            show_worktree_list(loaded_config, use_stderr=False)
 
-                captured = capsys.readouterr()
-                assert "main" in captured.err
+        output = out.getvalue()
+        assert output.index("abc123") < output.index("ghi789") < output.index("def456")
 
 
 class TestMainCallback:
     """Tests for the main() callback function."""
 
-    def test_main_without_subcommand_requires_initialized(self, tmp_path):
+    @pytest.mark.cwd("tmp_path")
+    def test_main_without_subcommand_requires_initialized(self, capsys):
         """Test main callback requires initialized project."""
-        with patch("worktrees.config.Path.cwd", return_value=tmp_path):
-            result = runner.invoke(app, [])
-            assert result.exit_code == 1
-            assert "not initialized" in result.output
+        ctx = SimpleNamespace(invoked_subcommand=None)
+        with pytest.raises(typer.Exit) as exc:
+            main(ctx)
 
-    def test_main_without_subcommand_shows_list(self, initialized_project):
+        assert exc.value.exit_code == 1
+        assert "not initialized" in capsys.readouterr().err
+
+    @pytest.mark.cwd("initialized_project_ro")
+    def test_main_without_subcommand_shows_list(
+        self, initialized_project_ro, monkeypatch, invoke, main_worktree
+    ):
         """Test main callback shows worktree list."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            worktrees = [
-                Worktree(
-                    path=initialized_project / "main", branch="main", commit="abc123"
-                ),
-            ]
-
-            with patch("worktrees.cli.list_worktrees", return_value=worktrees):
-                result = runner.invoke(app, [])
-                assert result.exit_code == 0
-                assert "main" in result.output
-
-    def test_main_with_subcommand_does_not_show_list(self, initialized_project):
+        worktrees = [main_worktree(initialized_project_ro)]
+        monkeypatch.setattr(cli, "list_worktrees", lambda _: worktrees)
+
+        result = invoke(_CMD_ROOT)
+        assert result.exit_code == 0
+        assert "main" in result.stdout
+
+    @pytest.mark.cwd("initialized_project_ro")
+    def test_main_with_subcommand_does_not_show_list(self, invoke):
         """Test main callback doesn't show list when subcommand is invoked."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            result = runner.invoke(app, ["status"])
-            # Should invoke status command, not the main list view
-            # Status command will check for initialization separately
-            assert result.exit_code == 0 or result.exit_code == 1
+        result = invoke(_CMD_STATUS)
+        # Should invoke status command, not the main list view
+        # Status command will check for initialization separately
+        assert result.exit_code == 0 or result.exit_code == 1
 
 
-class TestConstants:
-    """Tests for module constants."""
+def test_module_exports():
+    """Test the module exposes the questionary STYLE and the worktrees app."""
+    assert isinstance(STYLE, Style)
+    assert app.info.name == "worktrees"
 
-    def test_style_exists(self):
-        """Test STYLE constant is defined."""
-        assert STYLE is not None
 
-    def test_app_exists(self):
-        """Test app constant is defined."""
-        assert app is not None
-        assert app.info.name == "worktrees"
+@pytest.fixture
+def plain_repo(tmp_path, monkeypatch):
+    """Make tmp_path the cwd and look like a clean, non-bare git repository."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ic, "is_git_repo", lambda _: True)
+    monkeypatch.setattr(ic, "is_bare_repo", lambda _: False)
+    monkeypatch.setattr(ic, "has_uncommitted_changes", lambda _: False)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_confirm(monkeypatch, recorder):
+    """Replace questionary.confirm with a recorder whose prompt is cancelled."""
+    confirm = recorder(SimpleNamespace(ask=lambda: None))
+    monkeypatch.setattr(ic.questionary, "confirm", confirm)
+    return confirm
+
+
+@pytest.fixture
+def fake_config(monkeypatch, recorder):
+    """Replace WorktreesConfig in init with a recorder of its arguments."""
+    config = recorder(SimpleNamespace(save=lambda _: None))
+    monkeypatch.setattr(ic, "WorktreesConfig", config)
+    return config
 
 
 class TestInitNonInteractive:
     """Tests for the --bare/--no-bare and --worktrees-dir options of init."""
 
-    def test_init_bare_converts_to_bare(self, tmp_path):
+    def test_init_bare_converts_to_bare(
+        self, plain_repo, fake_confirm, monkeypatch, invoke
+    ):
         """Test --bare converts to bare repository without questionary prompt."""
-        with (
-            patch("worktrees.config.Path.cwd", return_value=tmp_path),
-            patch(
-                "worktrees.cli.init_clone.is_git_repo", return_value=True
-            ),
-            patch(
-                "worktrees.cli.init_clone.is_bare_repo", return_value=False
-            ),
-            patch(
-                "worktrees.cli.init_clone.has_uncommitted_changes",
-                return_value=False,
-            ),
-            patch(
-                "worktrees.cli.init_clone.get_untracked_gitignored_files",
-                return_value=[],
-            ),
-            patch(
-                "worktrees.cli.init_clone.convert_to_bare",
-                return_value=(tmp_path, "main"),
-            ) as mock_convert,
-            patch("worktrees.cli.init_clone.add_worktree"),
-            patch("questionary.confirm") as mock_confirm,
-        ):
-            result = runner.invoke(app, ["init", "--bare"])
-            assert result.exit_code == 0, result.output
-            mock_convert.assert_called_once_with(tmp_path)
-            mock_confirm.assert_not_called()
-
-    def test_init_no_bare_uses_default_path(self, tmp_path):
+        converted = []
+
+        def _convert_to_bare(path):
+            converted.append(path)
+            return plain_repo, "main"
+
+        monkeypatch.setattr(ic, "get_untracked_gitignored_files", lambda _: [])
+        monkeypatch.setattr(ic, "convert_to_bare", _convert_to_bare)
+        monkeypatch.setattr(ic, "add_worktree", lambda *args, **kwargs: None)
+
+        result = invoke(["init", "--bare"])
+        assert result.exit_code == 0, result.output
+        assert converted == [plain_repo]
+        assert fake_confirm.calls == []
+
+    def test_init_no_bare_uses_default_path(
+        self, plain_repo, fake_confirm, fake_config, invoke
+    ):
         """Test --no-bare creates config with default ~/.worktrees/repo_name path."""
-        with (
-            patch("worktrees.config.Path.cwd", return_value=tmp_path),
-            patch(
-                "worktrees.cli.init_clone.is_git_repo", return_value=True
-            ),
-            patch(
-                "worktrees.cli.init_clone.is_bare_repo", return_value=False
-            ),
-            patch(
-                "worktrees.cli.init_clone.has_uncommitted_changes",
-                return_value=False,
-            ),
-            patch(
-                "worktrees.cli.init_clone.WorktreesConfig"
-            ) as mock_config_cls,
-            patch("questionary.confirm") as mock_confirm,
-        ):
-            mock_instance = mock_config_cls.return_value
-            result = runner.invoke(app, ["init", "--no-bare"])
-            assert result.exit_code == 0, result.output
-            mock_confirm.assert_not_called()
-            mock_config_cls.assert_called_once()
-            call_kwargs = mock_config_cls.call_args
-            expected_dir = Path.home() / ".worktrees" / tmp_path.name
-            assert call_kwargs.kwargs["worktrees_dir"] == expected_dir
-            assert call_kwargs.kwargs["project_root"] == tmp_path
-
-    def test_init_no_bare_with_worktrees_dir(self, tmp_path):
+        result = invoke(["init", "--no-bare"])
+        assert result.exit_code == 0, result.output
+        assert fake_confirm.calls == []
+        expected_dir = Path.home() / ".worktrees" / plain_repo.name
+        assert fake_config.calls == [
+            call(worktrees_dir=expected_dir, project_root=plain_repo)
+        ]
+
+    def test_init_no_bare_with_worktrees_dir(
+        self, plain_repo, fake_confirm, fake_config, invoke
+    ):
         """Test --no-bare --worktrees-dir uses the provided path."""
         custom_dir = "/tmp/custom"
-        with (
-            patch("worktrees.config.Path.cwd", return_value=tmp_path),
-            patch(
-                "worktrees.cli.init_clone.is_git_repo", return_value=True
-            ),
-            patch(
-                "worktrees.cli.init_clone.is_bare_repo", return_value=False
-            ),
-            patch(
-                "worktrees.cli.init_clone.has_uncommitted_changes",
-                return_value=False,
-            ),
-            patch(
-                "worktrees.cli.init_clone.WorktreesConfig"
-            ) as mock_config_cls,
-            patch("questionary.confirm") as mock_confirm,
-        ):
-            mock_instance = mock_config_cls.return_value
-            result = runner.invoke(
-                app, ["init", "--no-bare", "--worktrees-dir", custom_dir]
-            )
-            assert result.exit_code == 0, result.output
-            mock_confirm.assert_not_called()
-            mock_config_cls.assert_called_once()
-            call_kwargs = mock_config_cls.call_args
-            assert call_kwargs.kwargs["worktrees_dir"] == Path(custom_dir)
-            assert call_kwargs.kwargs["project_root"] == tmp_path
-
-    def test_init_bare_with_worktrees_dir_errors(self, tmp_path):
+        result = invoke(["init", "--no-bare", "--worktrees-dir", custom_dir])
+        assert result.exit_code == 0, result.output
+        assert fake_confirm.calls == []
+        assert fake_config.calls == [
+            call(worktrees_dir=Path(custom_dir), project_root=plain_repo)
+        ]
+
+    def test_init_bare_with_worktrees_dir_errors(self, plain_repo, invoke):
         """Test --bare --worktrees-dir produces an error."""
-        with (
-            patch("worktrees.config.Path.cwd", return_value=tmp_path),
-            patch(
-                "worktrees.cli.init_clone.is_git_repo", return_value=True
-            ),
-            patch(
-                "worktrees.cli.init_clone.is_bare_repo", return_value=False
-            ),
-            patch(
-                "worktrees.cli.init_clone.has_uncommitted_changes",
-                return_value=False,
-            ),
-        ):
-            result = runner.invoke(
-                app, ["init", "--bare", "--worktrees-dir", "/tmp/x"]
-            )
-            assert result.exit_code == 1
-            assert "--worktrees-dir cannot be used with --bare" in result.output
-
-    def test_init_neither_bare_prompts(self, tmp_path):
+        result = invoke(["init", "--bare", "--worktrees-dir", "/tmp/x"])
+        assert result.exit_code == 1
+        assert "--worktrees-dir cannot be used with --bare" in result.stderr
+
+    def test_init_neither_bare_prompts(self, plain_repo, fake_confirm, invoke):
         """Test init without --bare/--no-bare prompts via questionary.confirm."""
-        with (
-            patch("worktrees.config.Path.cwd", return_value=tmp_path),
-            patch(
-                "worktrees.cli.init_clone.is_git_repo", return_value=True
-            ),
-            patch(
-                "worktrees.cli.init_clone.is_bare_repo", return_value=False
-            ),
-            patch(
-                "worktrees.cli.init_clone.has_uncommitted_changes",
-                return_value=False,
-            ),
-            patch("questionary.confirm") as mock_confirm,
-        ):
-            # Simulate user cancelling the prompt (returns None)
-            mock_confirm.return_value.ask.return_value = None
-            result = runner.invoke(app, ["init"])
-            mock_confirm.assert_called_once()
+        # The recorded prompt is cancelled (ask returns None)
+        result = invoke(["init"])
+        assert result.exit_code == 0, result.output
+        [prompt] = fake_confirm.calls
+        assert "bare" in prompt.args[0]
+        assert prompt.kwargs["default"] is False
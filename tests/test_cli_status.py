@@ -1,296 +1,210 @@
 """Tests for status CLI command."""
 
-import json
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 
 import pytest
-from typer.testing import CliRunner
 
-from worktrees.cli import app
-from worktrees.config import WORKTREES_JSON
+from worktrees.cli import status as status_mod
+from worktrees.cli.status import status
 from worktrees.git import GitError, Worktree
 
-runner = CliRunner()
+pytestmark = pytest.mark.xdist_group("cli_status")
+
+
+class _UnrelatablePath(type(Path())):
+    """Path whose is_relative_to raises ValueError for all but ``relatable``.
+
+    Set ``relatable`` on the instance after construction; the constructor
+    stays stock so pathlib can build derived paths (e.g. parents) with
+    ``type(self)(...)``, which then fall back to the class default.
+    """
+
+    relatable = None
+
+    def is_relative_to(self, other):
+        if other == self.relatable:
+            return True
+        raise ValueError("path not relative")
 
 
 @pytest.fixture
-def initialized_project(tmp_path):
-    """Create an initialized worktrees project."""
-    config_file = tmp_path / WORKTREES_JSON
-    config_file.write_text(
-        json.dumps(
-            {
-                "version": "1.0",
-                "worktreesDir": ".",
-                "setup": {"autoDetect": True, "commands": []},
-                "marks": {},
-            }
-        )
-    )
-    return tmp_path
+def status_env(cli_env):
+    """Return a helper that places status at *cwd* among the given worktrees."""
+
+    def _setup(cwd, *worktrees, branch="feature", valid=True, dirty=False):
+        cli_env.set_cwd(cwd)
+        cli_env.set_git(branch, valid=valid, dirty=dirty)
+        cli_env.set_worktrees(list(worktrees))
+
+    return _setup
 
 
 class TestStatusCommand:
     """Tests for the status command."""
 
-    def test_status_requires_initialized(self, tmp_path):
+    def test_status_requires_initialized(self, tmp_path, cli_env, run):
         """Test status command requires initialized project."""
-        with patch("worktrees.config.Path.cwd", return_value=tmp_path):
-            result = runner.invoke(app, ["status"])
-            assert result.exit_code == 1
-            assert "not initialized" in result.output
+        cli_env.set_cwd(tmp_path)
+        exit_code, output = run("status")
+        assert exit_code == 1
+        assert "not initialized" in output
 
-    def test_status_handles_git_error(self, initialized_project):
+    def test_status_handles_git_error(self, initialized_project, cli_env, call_direct):
         """Test status command handles GitError during list_worktrees."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch(
-                "worktrees.cli.status.list_worktrees", side_effect=GitError("git error")
-            ):
-                result = runner.invoke(app, ["status"])
-                assert result.exit_code == 1
-                assert "git error" in result.output
-
-    def test_status_not_in_worktree(self, initialized_project):
+        cli_env.set_cwd(initialized_project)
+        cli_env.set_worktrees(GitError("git error"))
+        exit_code, output = call_direct(status)
+        assert exit_code == 1
+        assert "git error" in output
+
+    def test_status_not_in_worktree(self, initialized_project, status_env, call_direct):
         """Test status command when not in a worktree."""
-        with patch("worktrees.config.Path.cwd", return_value=initialized_project):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=False):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(
-                            path=initialized_project / "main",
-                            branch="main",
-                            commit="abc123",
-                        )
-                    ]
-
-                    result = runner.invoke(app, ["status"])
-                    assert result.exit_code == 0
-                    assert "not in a worktree" in result.output
-                    assert "Project" in result.output
-                    assert "worktrees:  1" in result.output
-
-    def test_status_in_worktree_shows_info(self, initialized_project, tmp_path):
+        status_env(
+            initialized_project,
+            Worktree(path=initialized_project / "main", branch="main", commit="abc123"),
+            valid=False,
+        )
+
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "not in a worktree" in output
+        assert "Project" in output
+        assert "worktrees:  1" in output
+
+    def test_status_in_worktree_shows_info(
+        self, initialized_project, status_env, call_direct
+    ):
         """Test status command shows worktree info when inside one."""
         worktree_path = initialized_project / "feature"
         worktree_path.mkdir()
+        status_env(
+            worktree_path,
+            Worktree(path=worktree_path, branch="feature", commit="abc123"),
+        )
+
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "feature" in output
+        assert "clean" in output
+        assert "worktrees:  1" in output
 
-        with patch("worktrees.config.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(path=worktree_path, branch="feature", commit="abc123")
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch",
-                        return_value="feature",
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=False,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "feature" in result.output
-                            assert "clean" in result.output
-                            assert "worktrees:  1" in result.output
-
-    def test_status_shows_uncommitted_changes(self, initialized_project):
+    def test_status_shows_uncommitted_changes(
+        self, initialized_project, status_env, call_direct
+    ):
         """Test status command shows uncommitted changes."""
         worktree_path = initialized_project / "feature"
         worktree_path.mkdir()
+        status_env(
+            worktree_path,
+            Worktree(path=worktree_path, branch="feature", commit="abc123"),
+            dirty=True,
+        )
+
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "uncommitted changes" in output
 
-        with patch("worktrees.config.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(path=worktree_path, branch="feature", commit="abc123")
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch",
-                        return_value="feature",
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=True,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "uncommitted changes" in result.output
-
-    def test_status_get_current_branch_error_shows_detached(self, initialized_project):
+    def test_status_get_current_branch_error_shows_detached(
+        self, initialized_project, status_env, call_direct
+    ):
         """Test status command handles get_current_branch error gracefully."""
         worktree_path = initialized_project / "feature"
         worktree_path.mkdir()
+        status_env(
+            worktree_path,
+            Worktree(path=worktree_path, branch="feature", commit="abc123"),
+            branch=GitError("error"),
+        )
+
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "feature" in output
 
-        with patch("worktrees.config.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(path=worktree_path, branch="feature", commit="abc123")
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch",
-                        side_effect=GitError("error"),
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=False,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "feature" in result.output
-
-    def test_status_shows_mark_if_present(self, initialized_project):
+    def test_status_shows_mark_if_present(
+        self, initialized_project, status_env, call_direct, write_config
+    ):
         """Test status command displays mark when set."""
         worktree_path = initialized_project / "feature"
         worktree_path.mkdir()
-
-        # Add mark to config
-        config_file = initialized_project / WORKTREES_JSON
-        config_file.write_text(
-            json.dumps(
-                {
-                    "version": "1.0",
-                    "worktreesDir": ".",
-                    "setup": {"autoDetect": True, "commands": []},
-                    "marks": {"feature": "important"},
-                }
-            )
+        write_config(initialized_project, marks={"feature": "important"})
+        status_env(
+            worktree_path,
+            Worktree(path=worktree_path, branch="feature", commit="abc123"),
         )
 
-        with patch("worktrees.config.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(path=worktree_path, branch="feature", commit="abc123")
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch",
-                        return_value="feature",
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=False,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "important" in result.output
-
-    def test_status_excludes_bare_from_count(self, initialized_project):
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "important" in output
+
+    def test_status_excludes_bare_from_count(
+        self, initialized_project, status_env, call_direct
+    ):
         """Test status command excludes bare repo from worktree count."""
         worktree_path = initialized_project / "feature"
         worktree_path.mkdir()
+        status_env(
+            worktree_path,
+            Worktree(path=initialized_project, branch="(bare)", commit="abc123"),
+            Worktree(path=worktree_path, branch="feature", commit="abc123"),
+        )
 
-        with patch("worktrees.config.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(
-                            path=initialized_project, branch="(bare)", commit="abc123"
-                        ),
-                        Worktree(path=worktree_path, branch="feature", commit="abc123"),
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch",
-                        return_value="feature",
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=False,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "worktrees:  1" in result.output
-
-    def test_status_in_nested_worktree_path(self, initialized_project):
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "worktrees:  1" in output
+
+    def test_status_in_nested_worktree_path(
+        self, initialized_project, status_env, call_direct
+    ):
         """Test status command finds worktree when in nested path."""
         worktree_path = initialized_project / "feature"
         nested_path = worktree_path / "src" / "nested"
         nested_path.mkdir(parents=True)
+        status_env(
+            nested_path, Worktree(path=worktree_path, branch="feature", commit="abc123")
+        )
 
-        with patch("worktrees.config.Path.cwd", return_value=nested_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(path=worktree_path, branch="feature", commit="abc123")
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch",
-                        return_value="feature",
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=False,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "feature" in result.output
-
-    def test_status_shows_deepest_matching_worktree(self, initialized_project):
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "feature" in output
+
+    def test_status_shows_deepest_matching_worktree(
+        self, initialized_project, status_env, call_direct
+    ):
         """Test status command selects deepest matching worktree."""
         outer_path = initialized_project / "outer"
         inner_path = outer_path / "inner"
         nested_path = inner_path / "src"
         nested_path.mkdir(parents=True)
+        status_env(
+            nested_path,
+            Worktree(path=outer_path, branch="outer", commit="abc123"),
+            Worktree(path=inner_path, branch="inner", commit="def456"),
+            branch="inner",
+        )
 
-        with patch("worktrees.config.Path.cwd", return_value=nested_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    mock_list.return_value = [
-                        Worktree(path=outer_path, branch="outer", commit="abc123"),
-                        Worktree(path=inner_path, branch="inner", commit="def456"),
-                    ]
-
-                    with patch(
-                        "worktrees.cli.status.get_current_branch", return_value="inner"
-                    ):
-                        with patch(
-                            "worktrees.cli.status.has_uncommitted_changes",
-                            return_value=False,
-                        ):
-                            result = runner.invoke(app, ["status"])
-                            assert result.exit_code == 0
-                            assert "inner" in result.output
-
-    def test_status_handles_value_error_on_relative_path(self, initialized_project):
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "inner" in output
+
+    def test_status_handles_value_error_on_relative_path(
+        self, initialized_project, status_env, call_direct, monkeypatch
+    ):
         """Test status command handles ValueError when checking relative paths."""
+        other_path = initialized_project / "other"
         worktree_path = initialized_project / "feature"
-        worktree_path.mkdir()
+        cwd = _UnrelatablePath(worktree_path / "src")
+        cwd.relatable = worktree_path
+        cwd.mkdir(parents=True)
+        status_env(
+            cwd,
+            Worktree(path=other_path, branch="other", commit="abc123"),
+            Worktree(path=worktree_path, branch="feature", commit="abc123"),
+        )
+        # chdir alone would hand status a plain Path from Path.cwd(); swap
+        # only the status module's Path so project lookup stays untouched
+        monkeypatch.setattr(status_mod, "Path", SimpleNamespace(cwd=lambda: cwd))
 
-        with patch("worktrees.config.Path.cwd", return_value=worktree_path):
-            with patch("worktrees.cli.status.is_valid_worktree", return_value=True):
-                with patch("worktrees.cli.status.list_worktrees") as mock_list:
-                    # Create a worktree that will raise ValueError on is_relative_to
-                    mock_worktree = MagicMock()
-                    mock_worktree.path = worktree_path
-                    mock_worktree.branch = "feature"
-                    mock_worktree.commit = "abc123"
-
-                    # Mock is_relative_to to raise ValueError
-                    def mock_relative_to(other):
-                        if other == worktree_path:
-                            return True
-                        raise ValueError("path not relative")
-
-                    with patch.object(
-                        Path, "is_relative_to", side_effect=mock_relative_to
-                    ):
-                        mock_list.return_value = [mock_worktree]
-
-                        with patch(
-                            "worktrees.cli.status.get_current_branch",
-                            return_value="feature",
-                        ):
-                            with patch(
-                                "worktrees.cli.status.has_uncommitted_changes",
-                                return_value=False,
-                            ):
-                                result = runner.invoke(app, ["status"])
-                                assert result.exit_code == 0
+        exit_code, output = call_direct(status)
+        assert exit_code == 0
+        assert "feature" in output
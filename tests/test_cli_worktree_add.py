@@ -1,34 +1,16 @@
 """Tests for worktree add CLI command with tmux integration."""
 
-import json
 import subprocess
 from unittest.mock import patch
 
-import pytest
 from typer.testing import CliRunner
 
 from worktrees.cli import app
-from worktrees.config import WORKTREES_JSON
 from worktrees.git import GitError
 
 runner = CliRunner()
 
-
-@pytest.fixture
-def initialized_project(tmp_path):
-    """Create an initialized worktrees project."""
-    config_file = tmp_path / WORKTREES_JSON
-    config_file.write_text(
-        json.dumps(
-            {
-                "version": "1.0",
-                "worktreesDir": ".",
-                "setup": {"autoDetect": True, "commands": []},
-                "marks": {},
-            }
-        )
-    )
-    return tmp_path
+_VENV_SETUP = {"autoDetect": False, "commands": ["python -m venv .venv"]}
 
 
 class TestWorktreeAddCommand:
@@ -112,22 +94,9 @@ class TestWorktreeAddCommand:
                         assert "Linked" in result.output
                         assert ".env" in result.output
 
-    def test_add_runs_setup_commands(self, initialized_project):
+    def test_add_runs_setup_commands(self, initialized_project, write_config):
         """Test add command runs setup commands from config."""
-        config_file = initialized_project / WORKTREES_JSON
-        config_file.write_text(
-            json.dumps(
-                {
-                    "version": "1.0",
-                    "worktreesDir": ".",
-                    "setup": {
-                        "autoDetect": False,
-                        "commands": ["python -m venv .venv"],
-                    },
-                    "marks": {},
-                }
-            )
-        )
+        write_config(initialized_project, setup=_VENV_SETUP)
         worktree_path = initialized_project / "feature"
 
         with patch("worktrees.config.Path.cwd", return_value=initialized_project):
@@ -149,22 +118,11 @@ class TestWorktreeAddCommand:
                             assert "Setup" in result.output
                             mock_setup.assert_called_once()
 
-    def test_add_skip_setup_commands_with_flag(self, initialized_project):
+    def test_add_skip_setup_commands_with_flag(
+        self, initialized_project, write_config
+    ):
         """Test add command skips setup commands with --no-setup flag."""
-        config_file = initialized_project / WORKTREES_JSON
-        config_file.write_text(
-            json.dumps(
-                {
-                    "version": "1.0",
-                    "worktreesDir": ".",
-                    "setup": {
-                        "autoDetect": False,
-                        "commands": ["python -m venv .venv"],
-                    },
-                    "marks": {},
-                }
-            )
-        )
+        write_config(initialized_project, setup=_VENV_SETUP)
         worktree_path = initialized_project / "feature"
 
         with patch("worktrees.config.Path.cwd", return_value=initialized_project):
@@ -345,7 +303,7 @@ class TestWorktreeAddTmuxIntegration:
 
                         assert result.exit_code == 0
                         assert "Next" in result.output
-                        assert f"cd {worktree_path}" in result.output
+                        assert f"cd {worktree_path}" in " ".join(result.output.split())
 
     def test_add_shows_manual_instructions_with_venv(self, initialized_project):
         """Test add command shows venv activation in manual instructions."""
@@ -369,7 +327,8 @@ class TestWorktreeAddTmuxIntegration:
                         result = runner.invoke(app, ["add", "feature"])
 
                         assert result.exit_code == 0
-                        assert "source .venv/bin/activate" in result.output
+                        output = " ".join(result.output.split())
+                        assert "source .venv/bin/activate" in output
 
     def test_add_handles_tmux_not_found(self, initialized_project):
         """Test add command handles tmux not being installed."""
@@ -573,7 +532,7 @@ class TestWorktreeAddNonInteractive:
                         assert result.exit_code == 0
                         mock_confirm.assert_not_called()
                         assert "Next" in result.output
-                        assert f"cd {worktree_path}" in result.output
+                        assert f"cd {worktree_path}" in " ".join(result.output.split())
 
     def test_add_tmux_starts_session(self, initialized_project):
         """Test --tmux creates tmux session without prompting."""
@@ -690,7 +649,8 @@ class TestWorktreeAddNonInteractive:
                                 mock_confirm.assert_not_called()
                                 mock_select.assert_not_called()
                                 assert "Next" in result.output
-                                assert f"cd {worktree_path}" in result.output
+                                output = " ".join(result.output.split())
+                                assert f"cd {worktree_path}" in output
                                 assert mock_add.call_args[1]["create_branch"] is True
                                 assert (
                                     mock_add.call_args[1]["base_branch"] == "main"
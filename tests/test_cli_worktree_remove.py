@@ -1,36 +1,15 @@
 """Tests for worktree remove CLI command with --delete-remaining option."""
 
-import json
-from pathlib import Path
 from unittest.mock import patch
 
-import pytest
 from typer.testing import CliRunner
 
 from worktrees.cli import app
-from worktrees.config import WORKTREES_JSON
 from worktrees.git import GitError
 
 runner = CliRunner()
 
 
-@pytest.fixture
-def initialized_project(tmp_path):
-    """Create an initialized worktrees project."""
-    config_file = tmp_path / WORKTREES_JSON
-    config_file.write_text(
-        json.dumps(
-            {
-                "version": "1.0",
-                "worktreesDir": ".",
-                "setup": {"autoDetect": True, "commands": []},
-                "marks": {},
-            }
-        )
-    )
-    return tmp_path
-
-
 class TestWorktreeRemoveDeleteRemaining:
     """Tests for the --delete-remaining option on the 'worktrees remove' command."""
 
@@ -15,10 +15,19 @@ import pytest
 
 from worktrees.git import (
     GitError,
+    branch_exists,
     convert_to_bare,
+    get_current_branch,
+    get_default_branch,
+    get_git_dir,
     get_remote_url,
+    get_repo_name_from_url,
+    get_repo_root,
+    has_uncommitted_changes,
     is_bare_repo,
     is_git_repo,
+    is_valid_worktree,
+    list_local_branches,
     run_git,
 )
 
@@ -580,8 +589,6 @@ class TestHasUncommittedChanges:
         mock_result.stdout = "M file.txt\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import has_uncommitted_changes
-
         assert has_uncommitted_changes() is True
 
     @patch("worktrees.git.run_git")
@@ -591,8 +598,6 @@ class TestHasUncommittedChanges:
         mock_result.stdout = ""
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import has_uncommitted_changes
-
         assert has_uncommitted_changes() is False
 
 
@@ -606,8 +611,6 @@ class TestGetCurrentBranch:
         mock_result.stdout = "main\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import get_current_branch
-
         branch = get_current_branch()
         assert branch == "main"
 
@@ -618,8 +621,6 @@ class TestGetCurrentBranch:
         mock_result.stdout = "feature/test\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import get_current_branch
-
         custom_path = Path("/test/path")
         branch = get_current_branch(custom_path)
         assert branch == "feature/test"
@@ -639,8 +640,6 @@ class TestGetDefaultBranch:
         mock_result.stdout = "refs/remotes/origin/main\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import get_default_branch
-
         branch = get_default_branch()
         assert branch == "main"
 
@@ -662,8 +661,6 @@ class TestGetDefaultBranch:
 
         mock_run_git.side_effect = side_effect
 
-        from worktrees.git import get_default_branch
-
         branch = get_default_branch()
         assert branch == "main"
 
@@ -685,8 +682,6 @@ class TestGetDefaultBranch:
 
         mock_run_git.side_effect = side_effect
 
-        from worktrees.git import get_default_branch
-
         branch = get_default_branch()
         assert branch == "master"
 
@@ -705,8 +700,6 @@ class TestListLocalBranches:
         mock_run_git.return_value = mock_result
         mock_get_current.return_value = "dev"
 
-        from worktrees.git import list_local_branches
-
         branches = list_local_branches()
         assert branches == ["dev", "feature", "main"]
 
@@ -719,8 +712,6 @@ class TestListLocalBranches:
         mock_run_git.return_value = mock_result
         mock_get_current.side_effect = GitError("detached")
 
-        from worktrees.git import list_local_branches
-
         branches = list_local_branches()
         assert branches == ["main", "feature"]
 
@@ -735,8 +726,6 @@ class TestBranchExists:
         mock_result.stdout = "* main\n  feature\n  remotes/origin/main\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import branch_exists
-
         local, remote = branch_exists("feature")
         assert local is True
         assert remote is False
@@ -748,8 +737,6 @@ class TestBranchExists:
         mock_result.stdout = "  main\n  remotes/origin/feature\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import branch_exists
-
         local, remote = branch_exists("feature")
         assert local is False
         assert remote is True
@@ -761,8 +748,6 @@ class TestBranchExists:
         mock_result.stdout = "  feature\n  remotes/origin/feature\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import branch_exists
-
         local, remote = branch_exists("feature")
         assert local is True
         assert remote is True
@@ -778,8 +763,6 @@ class TestGetRepoRoot:
         mock_result.stdout = "/home/user/project\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import get_repo_root
-
         root = get_repo_root()
         assert root == Path("/home/user/project")
 
@@ -794,8 +777,6 @@ class TestGetGitDir:
         mock_result.stdout = "/home/user/project/.git\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import get_git_dir
-
         git_dir = get_git_dir()
         assert git_dir == Path("/home/user/project/.git")
 
@@ -806,8 +787,6 @@ class TestGetGitDir:
         mock_result.stdout = ".git\n"
         mock_run_git.return_value = mock_result
 
-        from worktrees.git import get_git_dir
-
         with patch("worktrees.git.Path.cwd", return_value=Path("/test/path")):
             git_dir = get_git_dir()
             assert git_dir == Path("/test/path/.git")
@@ -818,29 +797,21 @@ class TestGetRepoNameFromUrl:
 
     def test_get_repo_name_from_url_https(self):
         """Test extracting repo name from HTTPS URL."""
-        from worktrees.git import get_repo_name_from_url
-
         name = get_repo_name_from_url("https://github.com/user/repo.git")
         assert name == "repo"
 
     def test_get_repo_name_from_url_ssh(self):
         """Test extracting repo name from SSH URL."""
-        from worktrees.git import get_repo_name_from_url
-
         name = get_repo_name_from_url("git@github.com:user/repo.git")
         assert name == "repo"
 
     def test_get_repo_name_from_url_local_path(self):
         """Test extracting repo name from local path."""
-        from worktrees.git import get_repo_name_from_url
-
         name = get_repo_name_from_url("/path/to/repo.git")
         assert name == "repo"
 
     def test_get_repo_name_from_url_no_git_suffix(self):
         """Test extracting repo name without .git suffix."""
-        from worktrees.git import get_repo_name_from_url
-
         name = get_repo_name_from_url("https://github.com/user/repo")
         assert name == "repo"
 
@@ -853,14 +824,10 @@ class TestIsValidWorktree:
         git_file = tmp_path / ".git"
         git_file.write_text("gitdir: /path/to/.git/worktrees/main")
 
-        from worktrees.git import is_valid_worktree
-
         assert is_valid_worktree(tmp_path) is True
 
     def test_is_valid_worktree_false_no_git_file(self, tmp_path):
         """Test is_valid_worktree returns False when .git doesn't exist."""
-        from worktrees.git import is_valid_worktree
-
         assert is_valid_worktree(tmp_path) is False
 
     def test_is_valid_worktree_false_git_is_directory(self, tmp_path):
@@ -868,6 +835,4 @@ class TestIsValidWorktree:
         git_dir = tmp_path / ".git"
         git_dir.mkdir()
 
-        from worktrees.git import is_valid_worktree
-
         assert is_valid_worktree(tmp_path) is False